@@ -77,7 +77,7 @@ function App() {
 
   const handleLogout = async () => {
     try {
-      await authAPI.logout();
+      await authAPI.logout(localStorage.getItem('refreshToken'));
       localStorage.removeItem('fitnessToken');
       localStorage.removeItem('refreshToken');
       setIsAuthenticated(false);
@@ -88,7 +88,7 @@ export const authAPI = {
   },
   verifyToken: (token) => api.post('/token/verify/', { token }),
   refreshToken: (refresh) => api.post('/token/refresh/', { refresh }),
-  logout: () => api.post('/logout/'),
+  logout: (refresh) => api.post('/logout/', { refresh }),
 };
 
 export const goalsAPI = {
@@ -120,6 +120,7 @@ export const progressAPI = {
   getNutritionHistory: () => api.get('/api/progress/progress/nutrition_history/'),
   getWorkoutHistory: () => api.get('/api/progress/progress/workout_history/'),
   getMeasurementHistory: () => api.get('/api/progress/measurements/measurement_history/'),
+  getSeries: (params) => api.get('/api/progress/series/', { params }),
   addProgress: (data) => api.post('/api/progress/progress/', data),
   updateProgress: (id, data) => api.put(`/api/progress/progress/${id}/`, data),
   deleteProgress: (id) => api.delete(`/api/progress/progress/${id}/`),
@@ -136,5 +137,6 @@ export const dashboardAPI = {
 export const userAPI = {
   getProfile: () => api.get('/profile/'),
   updateProfile: (profileData) => api.put('/profile/', profileData),
+  exportData: (params) => api.get('/export/', { params, responseType: 'blob' }),
 };
 
@@ -0,0 +1,145 @@
+"""
+JWT authentication that resolves users from memory instead of the database.
+
+simplejwt's JWTAuthentication loads the full user row on every request.
+CachedJWTAuthentication looks the user up in two tiers:
+
+1. A per-process LRU of recently seen users, trusted for ``local_ttl``
+   seconds.
+2. The shared Django cache, keyed by user id and a per-user version token.
+
+Only the fields authentication and permission checks read are cached
+(``AUTH_FIELDS``), plus a digest of the password hash for simplejwt's
+revoke check; the hash itself never leaves the database. request.user is
+built with every other field deferred, so reading one queries the row
+instead of returning a stale or empty value, and saving it writes back
+only the cached fields. Views that update the user must reload it first.
+
+Saving or deleting a User replaces the version token in the shared cache
+and evicts the local entry. The saving process sees the change at once;
+every other process reloads the user within ``local_ttl`` (5 seconds), the
+longest any worker can keep accepting a deactivated user. Token validation and the is_active and
+password-change checks run exactly as in simplejwt, and tokens revoked at
+logout are rejected (see users.revocation).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from users.revocation import revoked_tokens
+
+USER_CACHE_TIMEOUT = 60 * 60
+AUTH_FIELDS = ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def _version_key(user_id):
+    return f'auth-user:{user_id}:version'
+
+
+def user_version(user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=USER_CACHE_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+class UserCache:
+    """Per-process LRU over the shared, version-keyed user cache"""
+    max_size = 2048
+    local_ttl = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, user_id):
+        # Token claims carry the id as a string, signals as the field's type
+        user_id = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                return self._build(entry[1])
+
+        version = user_version(user_id)
+        key = f'auth-user:{user_id}:{version}'
+        fields = cache.get(key)
+        if fields is None:
+            User = get_user_model()
+            fields = (
+                User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values(*AUTH_FIELDS, 'password').first()
+            )
+            if fields is None:
+                return None
+            fields['password_digest'] = get_md5_hash_password(fields.pop('password'))
+            cache.set(key, fields, timeout=USER_CACHE_TIMEOUT)
+
+        with self._lock:
+            self._entries[user_id] = (now + self.local_ttl, fields)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return self._build(fields)
+
+    @staticmethod
+    def _build(fields):
+        """A User with only AUTH_FIELDS loaded; other fields load on access"""
+        User = get_user_model()
+        names = [field.attname for field in User._meta.concrete_fields if field.attname in AUTH_FIELDS]
+        user = User.from_db(None, names, [fields[name] for name in names])
+        user._password_digest = fields['password_digest']
+        return user
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        cache.set(_version_key(user_id), time.time_ns(), timeout=USER_CACHE_TIMEOUT)
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if revoked_tokens.is_revoked(validated_token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_("Token has been revoked"))
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = user_cache.get(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != user._password_digest:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
@@ -0,0 +1,98 @@
+"""
+Versioned caching for the global, read-mostly catalogs (exercises, foods).
+
+Each catalog has a version token in the Django cache that is replaced on
+every write. The cache is shared between processes (see CACHES in
+settings), so a write from a management command reaches every server. The token is the write time in nanoseconds, so it doubles as
+the ``Last-Modified`` value. If the cache loses it, a new token is minted
+and clients simply re-download once. Serialized list bodies are cached
+under the version, so a repeat fetch is one cache lookup. A client that
+already holds the current version gets a 304.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.renderers import JSONRenderer
+
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(name):
+    return f'catalog:{name}:version'
+
+
+def catalog_version(name):
+    """Return the current version token for a catalog, minting one if absent"""
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_catalog_version(name):
+    version = time.time_ns()
+    cache.set(_version_key(name), version, timeout=None)
+    return version
+
+
+def _etag_matches(header, etag):
+    if header.strip() == '*':
+        return True
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class CachedCatalogMixin:
+    """
+    Serve ``list`` from a version-keyed body cache with ETag/Last-Modified.
+
+    Set ``catalog_name`` on the viewset and call ``bump_catalog_version``
+    with the same name whenever the underlying rows change.
+    """
+    catalog_name = None
+
+    def list(self, request, *args, **kwargs):
+        version = catalog_version(self.catalog_name)
+        query = request.META.get('QUERY_STRING', '')
+        variant = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()[:12]
+        etag = f'"{self.catalog_name}-{version}-{variant}"'
+        last_modified = version // 1_000_000_000
+
+        if self._not_modified(request, etag, last_modified):
+            response = HttpResponse(status=304)
+        else:
+            body_key = f'catalog:{self.catalog_name}:{version}:{variant}'
+            body = cache.get(body_key)
+            if body is None:
+                queryset = self.filter_queryset(self.get_queryset())
+                serializer = self.get_serializer(queryset, many=True)
+                body = JSONRenderer().render(serializer.data)
+                cache.set(body_key, body, timeout=CATALOG_TIMEOUT)
+            response = HttpResponse(body, content_type='application/json')
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def _not_modified(self, request, etag, last_modified):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, etag)
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since:
+            since = parse_http_date_safe(if_modified_since)
+            return since is not None and last_modified <= since
+        return False
+
@@ -0,0 +1,206 @@
+"""
+Compact response formats for list and history endpoints.
+
+Views opt in with CompactResponseMixin, which adds two renderers chosen
+through the Accept header (or ?format=):
+
+- application/vnd.fitness.columnar+json (format "columnar")
+- application/x-msgpack (format "msgpack", when msgpack is installed)
+
+Both turn a list of objects into one array per field, so keys are sent
+once rather than on every row. Date fields become integer day offsets
+from a base date listed under "day_offsets". Paginated responses have
+their "results" converted the same way; anything else passes through.
+
+The mixin also compresses rendered bodies of at least compress_min_bytes
+with brotli (when installed) or gzip, whichever the Accept-Encoding
+header prefers; codings it refuses with q=0 are never used.
+"""
+import re
+from datetime import date, datetime
+from functools import partial
+
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return None
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and _ISO_DATE_RE.match(value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _day_offsets(values):
+    """Return (base, offsets) if every non-null value is a date, else None"""
+    days = []
+    for value in values:
+        if value is None:
+            days.append(None)
+            continue
+        day = _as_date(value)
+        if day is None:
+            return None
+        days.append(day)
+    present = [day for day in days if day is not None]
+    if not present:
+        return None
+    base = min(present)
+    return base, [None if day is None else (day - base).days for day in days]
+
+
+def to_columns(rows):
+    """Convert a list of dicts to column arrays; None if rows is not such a list"""
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return None
+    fields = list(dict.fromkeys(key for row in rows for key in row))
+    columns = {}
+    bases = {}
+    for field in fields:
+        values = [row.get(field) for row in rows]
+        offsets = _day_offsets(values)
+        if offsets is not None:
+            bases[field], values = offsets[0].isoformat(), offsets[1]
+        columns[field] = values
+    return {'count': len(rows), 'columns': columns, 'day_offsets': bases}
+
+
+def compact(data):
+    columns = to_columns(data)
+    if columns is not None:
+        return columns
+    if isinstance(data, dict) and 'results' in data:
+        columns = to_columns(data['results'])
+        if columns is not None:
+            return {**data, 'results': columns}
+    return data
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    media_type = 'application/vnd.fitness.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(compact(data), accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/x-msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(compact(data), default=JSONEncoder().default, use_bin_type=True)
+
+
+def accepted_encodings(header):
+    """
+    Map each content-coding in an Accept-Encoding header to its q-value.
+
+    Codings listed with q=0 (or an unparseable q) are refused and left
+    out; "*" covers any coding not listed by name.
+    """
+    qualities = {}
+    refused = set()
+    for item in header.split(','):
+        coding, *params = (part.strip() for part in item.split(';'))
+        coding = coding.lower()
+        if coding == 'x-gzip':
+            coding = 'gzip'
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality <= 0:
+            refused.add(coding)
+        else:
+            qualities[coding] = quality
+    wildcard = qualities.pop('*', None)
+    if wildcard is not None:
+        for coding in ('br', 'gzip'):
+            if coding not in qualities and coding not in refused:
+                qualities[coding] = wildcard
+    return qualities
+
+
+def _choose_encoding(header):
+    """'br' or 'gzip' by client preference (br on ties), or None"""
+    qualities = accepted_encodings(header)
+    offered = ('br', 'gzip') if brotli is not None else ('gzip',)
+    candidates = [coding for coding in offered if coding in qualities]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda coding: qualities[coding])
+
+
+def compress_response(request, min_bytes, response):
+    """Post-render hook: brotli or gzip the body when it is large enough"""
+    if response.has_header('Content-Encoding') or len(response.content) < min_bytes:
+        return
+    patch_vary_headers(response, ('Accept-Encoding',))
+    encoding = _choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if encoding == 'br':
+        content = brotli.compress(response.content)
+    elif encoding == 'gzip':
+        content = compress_string(response.content, max_random_bytes=100)
+    else:
+        return
+    if len(content) >= len(response.content):
+        return
+
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response.headers['ETag'] = 'W/' + etag
+    response.content = content
+    response.headers['Content-Length'] = str(len(content))
+    response.headers['Content-Encoding'] = encoding
+
+
+class CompactResponseMixin:
+    """Offer columnar JSON and MessagePack, and compress large responses"""
+    compress_min_bytes = 1024
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        renderers.append(ColumnarJSONRenderer())
+        if msgpack is not None:
+            renderers.append(MessagePackRenderer())
+        return renderers
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response):
+            response.add_post_render_callback(
+                partial(compress_response, request, self.compress_min_bytes)
+            )
+        return response
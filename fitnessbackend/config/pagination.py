@@ -0,0 +1,135 @@
+import base64
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over a fixed, unique ordering.
+
+    Instead of OFFSET, every page filters on the sort key of the last row
+    of the previous page, so page N costs the same index range scan as
+    page 1. Pagination is opt-in: clients that send neither ``cursor`` nor
+    ``page_size`` still get a plain list, which keeps existing callers
+    working.
+    """
+    ordering = ('-id',)
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        encoded = params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self.seek_filter(self.decode_cursor(encoded, queryset.model)))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def seek_filter(self, values):
+        """
+        Build ``(f1, f2, ...) < (v1, v2, ...)`` (or ``>`` for ascending
+        fields) as an OR of AND terms. The leading bound on the first field
+        is repeated as a plain conjunct so the database can seek the index
+        directly instead of evaluating the OR over the whole range.
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        fields = []
+        for ordering_field in self.ordering:
+            descending = ordering_field.startswith('-')
+            fields.append((ordering_field.lstrip('-'), 'lt' if descending else 'gt'))
+
+        condition = Q()
+        for i, (name, lookup) in enumerate(fields):
+            term = Q(**{f'{name}__{lookup}': values[i]})
+            for j, (prev_name, _) in enumerate(fields[:i]):
+                term &= Q(**{prev_name: values[j]})
+            condition |= term
+
+        first_name, first_lookup = fields[0]
+        leading = Q(**{f'{first_name}__{first_lookup}e': values[0]})
+        return leading & condition
+
+    def encode_cursor(self, obj):
+        values = []
+        for ordering_field in self.ordering:
+            value = getattr(obj, ordering_field.lstrip('-'))
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            values.append(value)
+        raw = json.dumps(values, separators=(',', ':')).encode('ascii')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def decode_cursor(self, encoded, model):
+        """Return the cursor's values converted to the ordering fields' types"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        decoded = []
+        for ordering_field, value in zip(self.ordering, values):
+            field = model._meta.get_field(ordering_field.lstrip('-'))
+            try:
+                value = field.to_python(value)
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            decoded.append(value)
+        return decoded
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,172 @@
+"""
+Recompute Goal.current and Goal.status from the data each category tracks.
+
+- workout: number of workouts logged between start_date and end_date
+- nutrition: average calories per logged day in that window
+- weight: latest weight in the window (ProgressEntry and WeightEntry)
+- measurement: latest value in the window of the body measurement named
+  in the goal's title or description (e.g. "Waist to 80cm")
+
+Counting goals are reached at current >= target. Weight and measurement
+goals are reached when the latest value crosses the target from the side
+the first value in the window started on, so both loss and gain work.
+
+A write to a source table re-evaluates only that user's active goals in
+the matching category: one query loads the goals, one query computes
+every goal's value, and one bulk update writes back the goals that
+changed.
+"""
+import re
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from nutrition.models import Meal
+from progress.models import BodyMeasurement, ProgressEntry
+from progress.series import MEASUREMENT_FIELDS
+from users.snapshots import schedule_refresh
+from workouts.models import WeightEntry, Workout
+from .models import Goal
+
+ACTIVE_STATUSES = ('not_started', 'in_progress', 'completed')
+MEASUREMENT_WORDS = {
+    **{field: field for field in MEASUREMENT_FIELDS},
+    **{field.rstrip('s'): field for field in MEASUREMENT_FIELDS},
+    'arm': 'biceps',
+    'arms': 'biceps',
+}
+_WORD_RE = re.compile(r'[a-z]+')
+
+
+def _window(goal):
+    return Q(date__gte=goal.start_date, date__lte=goal.end_date)
+
+
+def measurement_field(goal):
+    """The BodyMeasurement field a measurement goal refers to, if any"""
+    for word in _WORD_RE.findall(f'{goal.title} {goal.description}'.lower()):
+        if word in MEASUREMENT_WORDS:
+            return MEASUREMENT_WORDS[word]
+    return None
+
+
+def evaluate_workout(user_id, goals):
+    totals = Workout.objects.filter(user_id=user_id).aggregate(**{
+        str(goal.id): Count('id', filter=_window(goal)) for goal in goals
+    })
+    return {goal.id: (totals[str(goal.id)], None) for goal in goals}
+
+
+def evaluate_nutrition(user_id, goals):
+    aggregates = {}
+    for goal in goals:
+        aggregates[f'calories_{goal.id}'] = Sum('calories', filter=_window(goal))
+        aggregates[f'days_{goal.id}'] = Count('date', filter=_window(goal), distinct=True)
+    totals = Meal.objects.filter(user_id=user_id).aggregate(**aggregates)
+    results = {}
+    for goal in goals:
+        days = totals[f'days_{goal.id}']
+        results[goal.id] = (round(totals[f'calories_{goal.id}'] / days, 1) if days else 0, None)
+    return results
+
+
+def _first_and_last(rows, goal):
+    """(latest, first) values dated inside the goal's window, or (None, None)"""
+    values = [value for day, value in rows if goal.start_date <= day <= goal.end_date]
+    if not values:
+        return None, None
+    return values[-1], values[0]
+
+
+def evaluate_weight(user_id, goals):
+    start = min(goal.start_date for goal in goals)
+    end = max(goal.end_date for goal in goals)
+    entries = WeightEntry.objects.filter(user_id=user_id, date__range=(start, end))
+    progress = ProgressEntry.objects.filter(
+        user_id=user_id, date__range=(start, end), weight__isnull=False
+    )
+    rows = sorted(
+        entries.order_by().values_list('date', 'weight')
+        .union(progress.order_by().values_list('date', 'weight'), all=True)
+    )
+    return {goal.id: _first_and_last(rows, goal) for goal in goals}
+
+
+def evaluate_measurement(user_id, goals):
+    fields = {goal.id: measurement_field(goal) for goal in goals}
+    goals = [goal for goal in goals if fields[goal.id]]
+    if not goals:
+        return {}
+    start = min(goal.start_date for goal in goals)
+    end = max(goal.end_date for goal in goals)
+    rows = list(
+        BodyMeasurement.objects.filter(user_id=user_id, date__range=(start, end))
+        .order_by('date', 'id')
+        .values_list('date', *MEASUREMENT_FIELDS)
+    )
+    results = {}
+    for goal in goals:
+        column = MEASUREMENT_FIELDS.index(fields[goal.id]) + 1
+        series = [(row[0], row[column]) for row in rows if row[column] is not None]
+        results[goal.id] = _first_and_last(series, goal)
+    return results
+
+
+EVALUATORS = {
+    'workout': evaluate_workout,
+    'nutrition': evaluate_nutrition,
+    'weight': evaluate_weight,
+    'measurement': evaluate_measurement,
+}
+
+
+def evaluate_goal_set(goals):
+    """Map goal id to (current, baseline) for goals of any users and categories"""
+    groups = {}
+    for goal in goals:
+        if goal.category in EVALUATORS:
+            groups.setdefault((goal.user_id, goal.category), []).append(goal)
+    results = {}
+    for (user_id, category), group in groups.items():
+        results.update(EVALUATORS[category](user_id, group))
+    return results
+
+
+def goal_status(goal, current, baseline):
+    if current is None or (current == 0 and baseline is None):
+        return 'not_started'
+    if baseline is not None and baseline > goal.target:
+        reached = current <= goal.target
+    else:
+        reached = current >= goal.target
+    return 'completed' if reached else 'in_progress'
+
+
+def evaluate_goals(user_id, category):
+    """Re-evaluate one user's active goals in a category; return how many changed"""
+    goals = list(Goal.objects.filter(
+        user_id=user_id,
+        category=category,
+        status__in=ACTIVE_STATUSES,
+        end_date__gte=timezone.now().date(),
+    ))
+    if not goals:
+        return 0
+
+    results = EVALUATORS[category](user_id, goals)
+    now = timezone.now()
+    changed = []
+    for goal in goals:
+        if goal.id not in results:
+            continue
+        current, baseline = results[goal.id]
+        status = goal_status(goal, current, baseline)
+        if current is None:
+            current = goal.current
+        if (current, status) != (goal.current, goal.status):
+            goal.current, goal.status, goal.updated_at = current, status, now
+            changed.append(goal)
+    if changed:
+        Goal.objects.bulk_update(changed, ['current', 'status', 'updated_at'])
+        # bulk_update sends no signals, and the snapshot counts completed goals
+        schedule_refresh(user_id)
+    return len(changed)
@@ -0,0 +1,88 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from goals.evaluation import evaluate_goal_set, goal_status, measurement_field
+from goals.models import Goal
+from users.snapshots import refresh_summaries
+
+OPEN_STATUSES = ('not_started', 'in_progress')
+
+
+def parse_day(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'Invalid date {value!r}; use YYYY-MM-DD')
+
+
+def final_status(goal, results):
+    """
+    'completed', 'failed', or None to leave the goal open.
+
+    Goals are re-evaluated over their whole window first, so readings
+    back-dated into it still count. Weight and measurement goals with no
+    readings in the window cannot be judged (their direction is unknown)
+    and are skipped. Measurement goals naming no measurement are kept by
+    hand and close on current >= target, like goals of unknown categories.
+    """
+    if goal.id in results:
+        current, baseline = results[goal.id]
+        if current is None:
+            return None
+        goal.current = current
+        return 'completed' if goal_status(goal, current, baseline) == 'completed' else 'failed'
+    if goal.category == 'weight' or (goal.category == 'measurement' and measurement_field(goal)):
+        return None
+    return 'completed' if goal.current >= goal.target else 'failed'
+
+
+class Command(BaseCommand):
+    help = 'Re-evaluate goals past their end date and close them as completed or failed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--today', type=parse_day, help='Sweep as of this date (default: today)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size <= 0:
+            raise CommandError('--batch-size must be positive')
+        today = options['today'] or timezone.now().date()
+
+        # Served by the (status, end_date) index. Skipped goals stay open,
+        # so batches advance by id rather than by dropping out of the filter.
+        overdue = Goal.objects.filter(status__in=OPEN_STATUSES, end_date__lt=today).order_by('id')
+        started = time.monotonic()
+        closed = skipped = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                batch = list(overdue.filter(id__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                results = evaluate_goal_set(batch)
+                now = timezone.now()
+                finished = []
+                for goal in batch:
+                    status = final_status(goal, results)
+                    if status is None:
+                        skipped += 1
+                        continue
+                    goal.status, goal.updated_at = status, now
+                    finished.append(goal)
+                Goal.objects.bulk_update(finished, ['current', 'status', 'updated_at'])
+                closed += len(finished)
+                # bulk_update sends no signals; snapshots count completed goals
+                user_ids = list({goal.user_id for goal in finished})
+                transaction.on_commit(lambda user_ids=user_ids: refresh_summaries(user_ids))
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{closed} goals closed, {skipped} skipped')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Closed {closed} overdue goals ({skipped} skipped, no readings to judge) '
+            f'in {time.monotonic() - started:.1f}s'
+        ))
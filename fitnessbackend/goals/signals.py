@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from nutrition.models import Meal
+from progress.models import BodyMeasurement, ProgressEntry
+from workouts.models import WeightEntry, Workout
+from .evaluation import evaluate_goals
+
+SOURCE_CATEGORIES = {
+    WeightEntry: 'weight',
+    ProgressEntry: 'weight',
+    Workout: 'workout',
+    Meal: 'nutrition',
+    BodyMeasurement: 'measurement',
+}
+
+
+def source_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        evaluate_goals(instance.user_id, SOURCE_CATEGORIES[sender])
+
+
+for model in SOURCE_CATEGORIES:
+    post_save.connect(source_changed, sender=model, dispatch_uid=f'goals-{model.__name__}-saved')
+    post_delete.connect(source_changed, sender=model, dispatch_uid=f'goals-{model.__name__}-deleted')
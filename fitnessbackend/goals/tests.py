@@ -1,3 +1,63 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from users.models import User
+from workouts.models import Exercise, WeightEntry, Workout
+from .models import Goal
+
+
+class ExpireGoalsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='sprinter', password='pass12345')
+
+    def goal(self, category, target, current=0, title='Goal', status='in_progress'):
+        return Goal.objects.create(
+            user=self.user, title=title, category=category, target=target, current=current, unit='',
+            start_date=date(2024, 1, 1), end_date=date(2024, 1, 31), status=status,
+        )
+
+    def expire(self):
+        call_command('expire_goals', today='2024-02-01', stdout=StringIO())
+
+    def status(self, goal):
+        goal.refresh_from_db()
+        return goal.status
+
+    def test_back_dated_reading_completes_weight_loss_goal(self):
+        reached = self.goal('weight', 75)
+        missed = self.goal('weight', 70)
+        WeightEntry.objects.create(user=self.user, weight=80, date=date(2024, 1, 2))
+        WeightEntry.objects.create(user=self.user, weight=74.5, date=date(2024, 1, 30))
+        self.expire()
+        self.assertEqual(self.status(reached), 'completed')
+        self.assertEqual(reached.current, 74.5)
+        self.assertEqual(self.status(missed), 'failed')
+
+    def test_goal_without_readings_stays_open(self):
+        weight = self.goal('weight', 75)
+        waist = self.goal('measurement', 80, title='Waist to 80cm')
+        self.expire()
+        self.assertEqual(self.status(weight), 'in_progress')
+        self.assertEqual(self.status(waist), 'in_progress')
+
+    def test_hand_kept_measurement_goal_closes_on_current(self):
+        met = self.goal('measurement', 10, current=12, title='Plank minutes')
+        unmet = self.goal('measurement', 10, current=4, title='Plank minutes')
+        self.expire()
+        self.assertEqual(self.status(met), 'completed')
+        self.assertEqual(self.status(unmet), 'failed')
 
-# Create your tests here.
+    def test_workout_goals_are_counted_over_their_window(self):
+        exercise = Exercise.objects.create(
+            name='Row', description='', muscle_group='Back', equipment='Machine', instructions=''
+        )
+        met = self.goal('workout', 2)
+        unmet = self.goal('workout', 3)
+        for day in (date(2024, 1, 10), date(2024, 1, 20), date(2024, 2, 1)):
+            Workout.objects.create(user=self.user, exercise=exercise, sets=3, reps=10, date=day)
+        self.expire()
+        self.assertEqual(self.status(met), 'completed')
+        self.assertEqual(self.status(unmet), 'failed')
+        self.assertEqual(unmet.current, 2)
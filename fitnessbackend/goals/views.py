@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
+from .evaluation import evaluate_goals
 from .models import Goal
 from .serializers import GoalSerializer
 
@@ -15,8 +16,15 @@ class GoalViewSet(viewsets.ModelViewSet):
         return Goal.objects.filter(user=self.request.user).order_by('-created_at')
 
     def perform_create(self, serializer):
-        """Save the goal with the current user"""
-        serializer.save(user=self.request.user)
+        """Save the goal with the current user and evaluate it against existing data"""
+        goal = serializer.save(user=self.request.user)
+        if evaluate_goals(goal.user_id, goal.category):
+            goal.refresh_from_db()
+
+    def perform_update(self, serializer):
+        goal = serializer.save()
+        if evaluate_goals(goal.user_id, goal.category):
+            goal.refresh_from_db()
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -3,8 +3,9 @@ from .models import Food, Meal
 
 @admin.register(Meal)
 class MealAdmin(admin.ModelAdmin):
-    list_display = ('user', 'food', 'calories', 'meal_type', 'date')
+    list_display = ('user', 'food', 'calories', 'protein', 'carbs', 'fats', 'meal_type', 'date')
     list_filter = ('meal_type', 'date', 'user')
     search_fields = ('food', 'user__username')
+    raw_id_fields = ('food_item',)
     date_hierarchy = 'date'
     ordering = ('-date',)  # Changed to only use date field
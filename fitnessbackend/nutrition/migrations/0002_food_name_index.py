@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nutrition', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='food',
+            name='name',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:29
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 500
+
+
+def link_meals_to_foods(apps, schema_editor):
+    """
+    Resolve existing Meal.food strings to Food rows and copy their macros.
+
+    Distinct names are processed in batches: one indexed name lookup per
+    batch, then one UPDATE per resolved name. Names without a matching
+    food are left unlinked.
+    """
+    Food = apps.get_model('nutrition', 'Food')
+    Meal = apps.get_model('nutrition', 'Meal')
+
+    names = list(
+        Meal.objects.filter(food_item__isnull=True)
+        .values_list('food', flat=True)
+        .distinct()
+        .order_by()
+    )
+    for start in range(0, len(names), BATCH_SIZE):
+        batch = names[start:start + BATCH_SIZE]
+        cleaned = {name: ' '.join(name.split()) for name in batch}
+        foods = {}
+        for food in Food.objects.filter(name__in=set(cleaned.values())).order_by('-id'):
+            foods[food.name] = food
+
+        with transaction.atomic():
+            for name, clean in cleaned.items():
+                food = foods.get(clean)
+                if food is None:
+                    continue
+                Meal.objects.filter(food=name, food_item__isnull=True).update(
+                    food_item=food,
+                    protein=food.protein,
+                    carbs=food.carbs,
+                    fats=food.fats,
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nutrition', '0002_food_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meal',
+            name='carbs',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='meal',
+            name='fats',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='meal',
+            name='food_item',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='meals', to='nutrition.food'),
+        ),
+        migrations.AddField(
+            model_name='meal',
+            name='protein',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='meal',
+            name='servings',
+            field=models.FloatField(default=1),
+        ),
+        migrations.RunPython(link_meals_to_foods, migrations.RunPython.noop),
+    ]
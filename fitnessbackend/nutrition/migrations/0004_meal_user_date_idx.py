@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nutrition', '0003_meal_food_item_macros'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meal',
+            index=models.Index(fields=['user', 'date'], name='nutrition_m_user_id_80eec6_idx'),
+        ),
+    ]
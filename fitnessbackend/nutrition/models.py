@@ -2,7 +2,7 @@ from django.db import models
 from django.conf import settings
 
 class Food(models.Model):
-    name = models.CharField(max_length=200)
+    name = models.CharField(max_length=200, db_index=True)
     calories = models.IntegerField()
     protein = models.FloatField()
     carbs = models.FloatField()
@@ -22,7 +22,21 @@ class Meal(models.Model):
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     food = models.CharField(max_length=200)
+    food_item = models.ForeignKey(
+        Food,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='meals'
+    )
+    servings = models.FloatField(default=1)
+    # Calories and macros are copied from food_item x servings when the
+    # meal is saved, so totals never need to join against Food. Meals
+    # without a food_item keep the values they were logged with.
     calories = models.IntegerField()
+    protein = models.FloatField(default=0)
+    carbs = models.FloatField(default=0)
+    fats = models.FloatField(default=0)
     meal_type = models.CharField(max_length=50, choices=MEAL_TYPES)
     date = models.DateField()
     notes = models.TextField(blank=True)
@@ -31,6 +45,18 @@ class Meal(models.Model):
 
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['user', 'date']),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.food_item_id is not None:
+            food = self.food_item
+            self.calories = round(food.calories * self.servings)
+            self.protein = food.protein * self.servings
+            self.carbs = food.carbs * self.servings
+            self.fats = food.fats * self.servings
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username}'s {self.meal_type} on {self.date}"
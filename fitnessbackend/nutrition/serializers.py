@@ -15,12 +15,33 @@ class FoodSerializer(serializers.ModelSerializer):
         return data
 
 class MealSerializer(serializers.ModelSerializer):
+    food = serializers.CharField(max_length=200, required=False)
+    calories = serializers.IntegerField(required=False)
+
     class Meta:
         model = Meal
-        fields = ['id', 'food', 'calories', 'meal_type', 'date', 'notes']
+        fields = ['id', 'food', 'food_item', 'servings', 'calories', 'protein',
+                  'carbs', 'fats', 'meal_type', 'date', 'notes']
         read_only_fields = ['id']
 
     def validate(self, data):
+        if data.get('servings', 1) <= 0:
+            raise serializers.ValidationError({"servings": "Servings must be greater than 0"})
+        # A partial update may change only servings or only food_item, so
+        # fill the other from the meal being updated.
+        if 'food_item' in data:
+            food_item = data['food_item']
+            if food_item is not None:
+                data.setdefault('food', food_item.name)
+        else:
+            food_item = self.instance.food_item if self.instance else None
+        if food_item is not None:
+            servings = data.get('servings', self.instance.servings if self.instance else 1)
+            # Linked meals always count the food's calories; Meal.save does
+            # the same for the macros, so any values sent are ignored.
+            data['calories'] = round(food_item.calories * servings)
+        if not data.get('food') and not (self.instance and self.partial):
+            raise serializers.ValidationError({"food": "This field is required"})
         if data.get('calories', 0) <= 0:
             raise serializers.ValidationError({"calories": "Calories must be greater than 0"})
         return data
@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from config.catalog import bump_catalog_version, catalog_version
+from .models import Food, Meal
+from .summary import invalidate_day
+from .typeahead import food_index
+
+
+@receiver(post_save, sender=Food)
+def food_saved(sender, instance, **kwargs):
+    previous = catalog_version('foods')
+    version = bump_catalog_version('foods')
+    food_index.apply_food_change(instance, previous, version)
+
+
+@receiver(post_delete, sender=Food)
+def food_deleted(sender, instance, **kwargs):
+    previous = catalog_version('foods')
+    version = bump_catalog_version('foods')
+    food_index.apply_food_change(instance, previous, version, deleted=True)
+
+
+@receiver(pre_save, sender=Meal)
+def remember_previous_date(sender, instance, **kwargs):
+    """Keep the stored date so moving a meal invalidates both days"""
+    instance._previous_date = None
+    if instance.pk:
+        instance._previous_date = (
+            Meal.objects.filter(pk=instance.pk)
+            .values_list('date', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Meal)
+def meal_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        food_index.record_meal(instance.food)
+    invalidate_day(instance.user_id, instance.date)
+    previous = getattr(instance, '_previous_date', None)
+    if previous and previous != instance.date:
+        invalidate_day(instance.user_id, previous)
+
+
+@receiver(post_delete, sender=Meal)
+def meal_deleted(sender, instance, **kwargs):
+    invalidate_day(instance.user_id, instance.date)
@@ -0,0 +1,65 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from .models import Meal
+
+SUMMARY_TIMEOUT = 60 * 60 * 24 * 7
+MACRO_FIELDS = ('calories', 'protein', 'carbs', 'fats')
+
+
+def _day_key(user_id, day):
+    return f'meal-summary:{user_id}:{day}'
+
+
+def empty_day(day):
+    return {
+        'date': day.isoformat(),
+        'calories': 0,
+        'protein': 0,
+        'carbs': 0,
+        'fats': 0,
+        'meals': 0,
+        'by_meal_type': {meal_type: 0 for meal_type, _ in Meal.MEAL_TYPES},
+    }
+
+
+def daily_summaries(user_id, start, end):
+    """
+    Return one summary per day from start to end inclusive.
+
+    Days already in the cache are served from it; the rest are computed in
+    a single grouped query and cached until a meal on that day changes.
+    """
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    cached = cache.get_many([_day_key(user_id, day) for day in days])
+
+    missing = [day for day in days if _day_key(user_id, day) not in cached]
+    if missing:
+        computed = {day: empty_day(day) for day in missing}
+        rows = (
+            Meal.objects.filter(user_id=user_id, date__in=missing)
+            .values('date', 'meal_type')
+            .annotate(
+                calories=Sum('calories'),
+                protein=Sum('protein'),
+                carbs=Sum('carbs'),
+                fats=Sum('fats'),
+                meals=Count('id'),
+            )
+            .order_by()
+        )
+        for row in rows:
+            summary = computed[row['date']]
+            for field in MACRO_FIELDS:
+                summary[field] += row[field]
+            summary['meals'] += row['meals']
+            summary['by_meal_type'][row['meal_type']] = row['calories']
+        fresh = {_day_key(user_id, day): summary for day, summary in computed.items()}
+        cache.set_many(fresh, timeout=SUMMARY_TIMEOUT)
+        cached.update(fresh)
+
+    return [cached[_day_key(user_id, day)] for day in days]
+
+
+def invalidate_day(user_id, day):
+    cache.delete(_day_key(user_id, day))
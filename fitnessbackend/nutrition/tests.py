@@ -1,3 +1,190 @@
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
+from rest_framework.test import APIClient
+from users.models import User
+from .management.commands.import_foods import read_csv, read_json_array, validate
+from .models import Food, Meal
+from .typeahead import food_index
+
+
+def food_fields(name, **fields):
+    return {
+        'name': name, 'calories': 100, 'protein': 1, 'carbs': 1, 'fats': 1, 'serving_size': '100 g',
+        **fields,
+    }
+
+
+class FoodTypeaheadTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='eater', password='pass12345')
+        Food.objects.bulk_create([Food(**food_fields(f'Bacon strip {i}')) for i in range(1200)])
+        self.banana = Food.objects.create(**food_fields('Banana'))
+        Meal.objects.bulk_create([
+            Meal(user=self.user, food='Banana', calories=105, meal_type='Snack', date=date.today())
+            for _ in range(50)
+        ])
+        food_index.clear()
+
+    def names(self, query, limit=5):
+        return [result['name'] for result in food_index.search(query, limit)]
+
+    def test_popular_food_ranks_first_for_short_prefix(self):
+        self.assertEqual(self.names('ba')[0], 'Banana')
+        self.assertEqual(self.names('b')[0], 'Banana')
+
+    def test_logged_meals_promote_a_food(self):
+        self.names('ba')
+        for _ in range(60):
+            Meal.objects.create(
+                user=self.user, food='Bacon strip 1199', calories=40, meal_type='Breakfast', date=date.today()
+            )
+        self.assertEqual(self.names('ba')[:2], ['Bacon strip 1199', 'Banana'])
+
+    def test_deleted_food_leaves_results(self):
+        self.names('ba')
+        self.banana.delete()
+        self.assertNotIn('Banana', self.names('ba'))
+        self.assertEqual(len(self.names('ba')), 5)
+
+    def test_other_words_filter_a_short_prefix(self):
+        Food.objects.create(**food_fields('Chicken breast'))
+        self.assertEqual(self.names('chicken b'), ['Chicken breast'])
+        self.assertEqual(self.names('b chicken'), ['Chicken breast'])
+
+
+class MealFoodItemTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cook', password='pass12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.oats = Food.objects.create(**food_fields('Oats', calories=150, protein=5))
+        self.eggs = Food.objects.create(**food_fields('Eggs', calories=70, protein=6))
+        response = self.client.post('/api/nutrition/meals/', {
+            'food_item': self.oats.id, 'servings': 1, 'meal_type': 'Breakfast', 'date': '2024-01-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.meal_id = response.data['id']
+
+    def patch(self, **fields):
+        response = self.client.patch(f'/api/nutrition/meals/{self.meal_id}/', fields, format='json')
+        self.assertEqual(response.status_code, 200)
+        return Meal.objects.get(pk=self.meal_id)
+
+    def test_servings_change_rescales_calories(self):
+        meal = self.patch(servings=2)
+        self.assertEqual((meal.calories, meal.protein), (300, 10))
+
+    def test_food_item_change_recomputes_calories(self):
+        meal = self.patch(food_item=self.eggs.id)
+        self.assertEqual((meal.calories, meal.protein), (70, 6))
+
+    def test_conflicting_calories_are_ignored(self):
+        meal = self.patch(servings=2, calories=999)
+        self.assertEqual(meal.calories, 300)
+
+    def test_unlinked_meal_keeps_its_calories(self):
+        meal = self.patch(food_item=None, calories=420)
+        self.assertEqual(meal.calories, 420)
+
+
+class MealPaginationTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='grazer', password='pass12345')
+        today = date.today()
+        Meal.objects.bulk_create([
+            Meal(user=user, food='Apple', calories=80, meal_type='Snack', date=today - timedelta(days=day))
+            for day in range(3) for _ in range(4)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_pages_cover_every_row_once(self):
+        expected = list(Meal.objects.order_by('-date', '-id').values_list('id', flat=True))
+        seen = []
+        url = '/api/nutrition/meals/?page_size=5'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+
+    def test_malformed_cursor_is_not_found(self):
+        response = self.client.get('/api/nutrition/meals/', {'cursor': 'WyJ4IiwieSJd'})
+        self.assertEqual(response.status_code, 404)
+
+
+class FoodImportReaderTests(TestCase):
+    document = (
+        '[ {"name": "Rice, \\"white\\" [cooked]", "calories": 130, "protein": 2.7, "carbs": 28,'
+        ' "fats": 0.3, "serving_size": "100 g"},\n'
+        ' {"name": "Broken", "calories": tru},\n'
+        ' 12345,\n'
+        ' {"name": "Lentils", "calories": 116, "protein": 9, "carbs": 20, "fats": 0.4,'
+        ' "serving_size": "100 g"} ]'
+    )
+
+    def test_json_array_reads_the_same_at_any_chunk_size(self):
+        for chunk_size in (1, 2, 3, 7, 64, 1 << 16):
+            records = list(read_json_array(StringIO(self.document), chunk_size))
+            self.assertEqual([index for index, _ in records], [1, 2, 3, 4], chunk_size)
+            self.assertEqual(records[0][1]['name'], 'Rice, "white" [cooked]')
+            self.assertIsInstance(records[1][1], ValueError)
+            self.assertEqual(records[2][1], 12345)
+            self.assertEqual(records[3][1]['name'], 'Lentils')
+
+    def test_truncated_json_array_reports_an_error(self):
+        records = list(read_json_array(StringIO('[{"name": "Oats"}, {"name": "Ry'), 4))
+        self.assertEqual(records[0], (1, {'name': 'Oats'}))
+        self.assertEqual(records[1][0], 2)
+        self.assertIsInstance(records[1][1], ValueError)
+
+    def test_json_array_requires_an_array(self):
+        with self.assertRaises(CommandError):
+            list(read_json_array(StringIO('{"name": "Oats"}')))
+
+    def test_rejected_rows_carry_their_errors(self):
+        results = list(validate(read_json_array(StringIO(self.document), 5)))
+        self.assertEqual([errors is None for _, _, errors in results], [True, False, False, True])
+        self.assertEqual(results[2][2], {'non_field_errors': ['Expected an object']})
+
+    def test_csv_rows_are_numbered_by_file_line(self):
+        stream = StringIO(
+            'name,calories,protein,carbs,fats,serving_size\n'
+            'Apple,52,0.3,14,0.2,100 g\n'
+            'Pear,-57,0.4,15,0.1,100 g\n'
+        )
+        results = list(validate(read_csv(stream)))
+        self.assertEqual([(line, errors is None) for line, _, errors in results], [(2, True), (3, False)])
+
+    def test_import_writes_rejects_and_upserts(self):
+        Food.objects.create(**food_fields('Apple', serving_size='100 g'))
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'foods.csv')
+            rejects = os.path.join(directory, 'rejects.jsonl')
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(
+                    'name,calories,protein,carbs,fats,serving_size\n'
+                    'Apple,52,0.3,14,0.2,100 g\n'
+                    'Pear,57,0.4,15,0.1,100 g\n'
+                    ',10,1,1,1,100 g\n'
+                    'Plum,abc,1,1,1,100 g\n'
+                )
+            out = StringIO()
+            call_command('import_foods', source, rejects=rejects, batch_size=2, stdout=out)
+            with open(rejects, encoding='utf-8') as f:
+                rejected = [json.loads(line) for line in f]
 
-# Create your tests here.
+        self.assertIn('4 rows read, 1 created, 1 updated, 2 rejected', out.getvalue())
+        self.assertEqual([row['line'] for row in rejected], [4, 5])
+        self.assertIn('name', rejected[0]['errors'])
+        self.assertIn('calories', rejected[1]['errors'])
+        self.assertEqual(Food.objects.get(name='Apple').calories, 52)
+        self.assertTrue(Food.objects.filter(name='Pear').exists())
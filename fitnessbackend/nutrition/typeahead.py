@@ -0,0 +1,265 @@
+"""
+Process-local prefix index for as-you-type food lookup.
+
+Every word of every food name is stored once in a sorted token array
+(tokens are interned, so repeated words cost one pointer each), with a
+parallel array of food ids. Every query word is treated as a prefix; a
+query bisects for each word, scans the slots of the most selective one and
+filters on the others, with no database access. Results are ranked by
+whether the whole name starts with the query, then by how often the food
+has been logged in meals.
+
+A word matching more than max_scan slots (a one- or two-letter prefix in
+a large catalog) is not scanned per keystroke. Its top_size best-ranked
+foods are computed once and cached per prefix; new foods and logged meals
+re-rank into those lists, and removing a listed food drops the list.
+
+The index is built on first use and kept current by Food and Meal signals
+in this process. Writes from other processes, such as import_foods, are
+detected through the 'foods' catalog version in the shared cache, read at
+most every version_check_interval seconds so keystrokes do not each cost
+a cache round trip; the index rebuilds within that interval of the write.
+Deleted or renamed foods leave stale token slots behind; they are skipped
+at query time and compacted away in memory once they pile up.
+"""
+import heapq
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+from django.db.models import Count
+from config.catalog import catalog_version
+from .models import Food, Meal
+
+_TOKEN_RE = re.compile(r'\w+')
+# Sorts after every token that starts with a given prefix
+_PREFIX_END = chr(sys.maxunicode)
+
+
+def normalize_food_name(name):
+    return ' '.join(_TOKEN_RE.findall(name.casefold()))
+
+
+def tokenize(name):
+    return [sys.intern(token) for token in _TOKEN_RE.findall(name.casefold())]
+
+
+class FoodIndex:
+    max_scan = 1000
+    # Cached ranking length for words matching more than max_scan slots;
+    # above the autocomplete limit to leave room for multi-word filtering
+    top_size = 100
+    compact_ratio = 0.25
+    # Seconds between reads of the shared catalog version
+    version_check_interval = 5
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._version = None
+        self._next_check = 0.0
+        self._tokens = []
+        self._ids = array('q')
+        self._foods = {}
+        self._ids_by_name = {}
+        self._popularity = {}
+        self._top_by_prefix = {}
+        self._stale = 0
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        if self._version is not None and now < self._next_check:
+            return
+        version = catalog_version('foods')
+        self._next_check = now + self.version_check_interval
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    self._build(version)
+
+    def _build(self, version):
+        popularity = {}
+        meal_counts = Meal.objects.values('food').annotate(count=Count('id')).order_by()
+        for row in meal_counts.iterator():
+            key = normalize_food_name(row['food'])
+            popularity[key] = popularity.get(key, 0) + row['count']
+
+        foods = {}
+        ids_by_name = {}
+        pairs = []
+        for food_id, name in Food.objects.values_list('id', 'name').iterator(chunk_size=5000):
+            tokens = tokenize(name)
+            key = ' '.join(tokens)
+            foods[food_id] = (name, key, tuple(tokens))
+            ids_by_name.setdefault(key, []).append(food_id)
+            pairs.extend((token, food_id) for token in set(tokens))
+        pairs.sort()
+
+        self._tokens = [token for token, _ in pairs]
+        self._ids = array('q', (food_id for _, food_id in pairs))
+        self._foods = foods
+        self._ids_by_name = ids_by_name
+        self._popularity = popularity
+        self._top_by_prefix = {}
+        self._stale = 0
+        self._version = version
+
+    def _compact(self):
+        live = sorted({
+            (token, food_id)
+            for token, food_id in zip(self._tokens, self._ids)
+            if food_id in self._foods and token in self._foods[food_id][2]
+        })
+        self._tokens = [token for token, _ in live]
+        self._ids = array('q', (food_id for _, food_id in live))
+        self._stale = 0
+
+    def search(self, query, limit=10):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        self._ensure_current()
+
+        whole = ' '.join(tokens)
+        with self._lock:
+            tokens_index = self._tokens
+            # Scan the query word with the fewest matching slots and filter
+            # on the rest, so a short last word cannot crowd out the match
+            ranges = {
+                token: (
+                    bisect_left(tokens_index, token),
+                    bisect_left(tokens_index, token + _PREFIX_END),
+                )
+                for token in tokens
+            }
+            scanned = min(ranges, key=lambda token: ranges[token][1] - ranges[token][0])
+            others = list(tokens)
+            others.remove(scanned)
+            start, end = ranges[scanned]
+            if end - start > self.max_scan:
+                # Too many slots to rank on every keystroke: start from the
+                # cached best-ranked foods for this word
+                candidates = [entry[-1] for entry in self._top(scanned, start, end)]
+                if others:
+                    # That ranking ignores the other words, which may filter
+                    # it all out; the first slots give them a fallback
+                    candidates.extend(self._live_ids(start, start + self.max_scan))
+            else:
+                candidates = self._live_ids(start, end)
+
+            ranked = []
+            for food_id in dict.fromkeys(candidates):
+                name, key, name_tokens = self._foods[food_id]
+                if others and not all(
+                    any(word.startswith(other) for word in name_tokens) for other in others
+                ):
+                    continue
+                ranked.append((
+                    0 if key.startswith(whole) else 1,
+                    -self._popularity.get(key, 0),
+                    len(name),
+                    name,
+                    food_id,
+                ))
+
+        return [
+            {'id': food_id, 'name': name}
+            for _, _, _, name, food_id in heapq.nsmallest(limit, ranked)
+        ]
+
+    def _live_ids(self, start, end):
+        """Food ids in a slot range, skipping slots left by deleted or renamed foods"""
+        ids = []
+        for position in range(start, min(end, len(self._tokens))):
+            food_id = self._ids[position]
+            food = self._foods.get(food_id)
+            if food is not None and self._tokens[position] in food[2]:
+                ids.append(food_id)
+        return ids
+
+    def _rank(self, food_id, prefix):
+        name, key, _ = self._foods[food_id]
+        return (0 if key.startswith(prefix) else 1, -self._popularity.get(key, 0), len(name), name, food_id)
+
+    def _top(self, prefix, start, end):
+        """The top_size best-ranked foods with a word starting with prefix, cached per prefix"""
+        top = self._top_by_prefix.get(prefix)
+        if top is None:
+            ids = set(self._live_ids(start, end))
+            top = heapq.nsmallest(self.top_size, (self._rank(food_id, prefix) for food_id in ids))
+            self._top_by_prefix[prefix] = top
+        return top
+
+    def _prefixes(self, tokens):
+        return {token[:length] for token in tokens for length in range(1, len(token) + 1)}
+
+    def _promote(self, food_id):
+        """Re-rank a new or more popular food in the cached top lists it belongs to"""
+        for prefix in self._prefixes(self._foods[food_id][2]):
+            top = self._top_by_prefix.get(prefix)
+            if top is None:
+                continue
+            top[:] = [entry for entry in top if entry[-1] != food_id]
+            insort(top, self._rank(food_id, prefix))
+            del top[self.top_size:]
+
+    def _demote(self, food_id, tokens):
+        """Drop cached top lists holding a removed food; the next query recomputes them"""
+        for prefix in self._prefixes(tokens):
+            top = self._top_by_prefix.get(prefix)
+            if top is not None and any(entry[-1] == food_id for entry in top):
+                del self._top_by_prefix[prefix]
+
+    def apply_food_change(self, food, previous_version, version, deleted=False):
+        """Apply a local Food write; adopt the new version only if nothing else changed"""
+        with self._lock:
+            if self._version is None:
+                return
+            if self._version != previous_version:
+                self._version = None
+                return
+
+            old = self._foods.get(food.id)
+            if old is not None and not deleted and old[0] == food.name:
+                self._version = version
+                return
+
+            self._foods.pop(food.id, None)
+            if old is not None:
+                self._demote(food.id, old[2])
+                self._stale += len(set(old[2]))
+                ids = self._ids_by_name.get(old[1], [])
+                if food.id in ids:
+                    ids.remove(food.id)
+
+            if not deleted:
+                tokens = tokenize(food.name)
+                key = ' '.join(tokens)
+                self._foods[food.id] = (food.name, key, tuple(tokens))
+                self._ids_by_name.setdefault(key, []).append(food.id)
+                for token in set(tokens):
+                    position = bisect_right(self._tokens, token)
+                    self._tokens.insert(position, token)
+                    self._ids.insert(position, food.id)
+                self._promote(food.id)
+
+            if self._stale > len(self._tokens) * self.compact_ratio:
+                self._compact()
+            self._version = version
+
+    def record_meal(self, food_name):
+        key = normalize_food_name(food_name)
+        with self._lock:
+            if self._version is not None and key in self._ids_by_name:
+                self._popularity[key] = self._popularity.get(key, 0) + 1
+                for food_id in self._ids_by_name[key]:
+                    self._promote(food_id)
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+
+
+food_index = FoodIndex()
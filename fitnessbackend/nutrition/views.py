@@ -1,22 +1,74 @@
 from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db.models import Sum
+from datetime import date, timedelta
+from config.catalog import CachedCatalogMixin
+from config.pagination import KeysetPagination
 from .models import Food, Meal
 from .serializers import FoodSerializer, MealSerializer
+from .summary import MACRO_FIELDS, daily_summaries
+from .typeahead import food_index
 
-class FoodViewSet(viewsets.ModelViewSet):
+class MealPagination(KeysetPagination):
+    ordering = ('-date', '-id')
+
+class FoodViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     queryset = Food.objects.all()
     serializer_class = FoodSerializer
     permission_classes = [permissions.IsAuthenticated]
+    catalog_name = 'foods'
+    autocomplete_max_results = 25
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Prefix lookup over food names from the in-memory index"""
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            limit = 10
+        limit = max(1, min(limit, self.autocomplete_max_results))
+        results = food_index.search(request.query_params.get('q', ''), limit)
+        return Response(results)
 
 class MealViewSet(viewsets.ModelViewSet):
     serializer_class = MealSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = MealPagination
+    default_window_days = 30
 
     def get_queryset(self):
         """Return meals for the current user only"""
-        return Meal.objects.filter(user=self.request.user).order_by('-date')
+        queryset = Meal.objects.filter(user=self.request.user).order_by('-date')
+        if self.action == 'list':
+            queryset = self.filter_list(queryset)
+        return queryset
+
+    def filter_list(self, queryset):
+        """Apply date_from/date_to/meal_type, defaulting to a recent window"""
+        params = self.request.query_params
+        date_from = self.parse_date('date_from')
+        date_to = self.parse_date('date_to')
+        if date_from is None and date_to is None:
+            date_from = date.today() - timedelta(days=self.default_window_days)
+        if date_from is not None:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to is not None:
+            queryset = queryset.filter(date__lte=date_to)
+        meal_type = params.get('meal_type')
+        if meal_type:
+            queryset = queryset.filter(meal_type=meal_type)
+        return queryset
+
+    def parse_date(self, param):
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValidationError({param: "Enter a date as YYYY-MM-DD"})
 
     def perform_create(self, serializer):
         """Save the meal with the current user"""
@@ -49,3 +101,38 @@ class MealViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         return super().destroy(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """Calories and macros per day and meal type for one day or the week containing it"""
+        try:
+            day = date.fromisoformat(request.query_params.get('date', ''))
+        except ValueError:
+            day = date.today()
+        period = request.query_params.get('period', 'day')
+        if period == 'week':
+            start = day - timedelta(days=day.weekday())
+            end = start + timedelta(days=6)
+        elif period == 'day':
+            start = end = day
+        else:
+            return Response(
+                {"detail": "period must be 'day' or 'week'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        days = daily_summaries(request.user.id, start, end)
+        by_meal_type = {meal_type: 0 for meal_type, _ in Meal.MEAL_TYPES}
+        for summary in days:
+            for meal_type, calories in summary['by_meal_type'].items():
+                by_meal_type[meal_type] += calories
+        totals = {
+            field: sum(summary[field] for summary in days) for field in MACRO_FIELDS
+        }
+        return Response({
+            'start': start,
+            'end': end,
+            **totals,
+            'by_meal_type': by_meal_type,
+            'days': days,
+        })
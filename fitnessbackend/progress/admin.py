@@ -6,6 +6,7 @@ class ProgressEntryAdmin(admin.ModelAdmin):
     list_display = ('user', 'date', 'weight', 'calories_consumed', 'workouts_completed')
     list_filter = ('date', 'user')
     search_fields = ('user__username',)
+    readonly_fields = ('calories_consumed', 'workouts_completed')
 
 @admin.register(BodyMeasurement)
 class BodyMeasurementAdmin(admin.ModelAdmin):
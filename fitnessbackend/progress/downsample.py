@@ -0,0 +1,66 @@
+"""
+Largest-Triangle-Three-Buckets downsampling for chart series.
+
+LTTB keeps the first and last points and, for every bucket in between,
+the point that forms the largest triangle with the previously kept point
+and the average of the next bucket. Peaks and troughs survive, so the
+chart keeps its shape at a fraction of the points. Triangle areas for a
+bucket and all bucket averages are computed with NumPy; only the walk
+across buckets is a Python loop, so the cost is O(rows) array work plus
+O(max_points) iterations.
+"""
+import numpy as np
+
+
+def lttb_indices(x, y, max_points):
+    """Return the indices of the points LTTB keeps from (x, y)"""
+    count = len(x)
+    if max_points >= count or max_points < 3:
+        return np.arange(count)
+
+    every = (count - 2) / (max_points - 2)
+    edges = (np.floor(np.arange(max_points - 1) * every) + 1).astype(np.int64)
+    edges[-1] = count - 1
+
+    # Averages of every middle bucket, then the last point, which acts as
+    # the "next bucket" for the final middle bucket.
+    sizes = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[:count - 1], edges[:-1]) / sizes, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:count - 1], edges[:-1]) / sizes, y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+    anchor = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_x, next_y = avg_x[bucket + 1], avg_y[bucket + 1]
+        areas = np.abs(
+            (x[anchor] - next_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (next_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(areas))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def downsample_rows(rows, fields, max_points):
+    """
+    Reduce date-ordered rows to at most ``max_points`` per field.
+
+    Each field is downsampled on its own non-null points and the rows
+    picked for any field are kept, so every series keeps its shape and the
+    result is bounded by ``max_points * len(fields)`` rows.
+    """
+    rows = list(rows)
+    if len(rows) <= max_points:
+        return rows
+
+    x = np.fromiter((row['date'].toordinal() for row in rows), dtype=np.float64, count=len(rows))
+    keep = np.zeros(len(rows), dtype=bool)
+    for field in fields:
+        y = np.array([row[field] for row in rows], dtype=np.float64)
+        present = np.flatnonzero(~np.isnan(y))
+        if len(present):
+            keep[present[lttb_indices(x[present], y[present], max_points)]] = True
+    return [rows[index] for index in np.flatnonzero(keep)]
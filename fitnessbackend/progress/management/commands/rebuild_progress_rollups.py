@@ -0,0 +1,75 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, Min
+from nutrition.models import Meal
+from progress.models import ProgressEntry
+from progress.rollups import clear_days, daily_totals, upsert_totals
+from workouts.models import Workout
+
+
+def parse_day(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'Invalid date {value!r}; use YYYY-MM-DD')
+
+
+def source_bounds():
+    """Earliest and latest day with a meal, workout or progress entry"""
+    bounds = [
+        model.objects.aggregate(first=Min('date'), last=Max('date'))
+        for model in (Meal, Workout, ProgressEntry)
+    ]
+    firsts = [bound['first'] for bound in bounds if bound['first']]
+    lasts = [bound['last'] for bound in bounds if bound['last']]
+    return (min(firsts), max(lasts)) if firsts else (None, None)
+
+
+class Command(BaseCommand):
+    help = 'Recompute calories_consumed and workouts_completed on progress entries for a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=parse_day, help='First day (default: earliest recorded day)')
+        parser.add_argument('--end', type=parse_day, help='Last day (default: latest recorded day)')
+        parser.add_argument('--chunk-days', type=int, default=31)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['chunk_days'] <= 0 or options['batch_size'] <= 0:
+            raise CommandError('--chunk-days and --batch-size must be positive')
+        first, last = source_bounds()
+        start = options['start'] or first
+        end = options['end'] or last
+        if start is None or end is None:
+            self.stdout.write('Nothing to rebuild')
+            return
+        if start > end:
+            raise CommandError('--start must not be after --end')
+
+        step = timedelta(days=options['chunk_days'])
+        started = time.monotonic()
+        written = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + step - timedelta(days=1), end)
+            span = (chunk_start, chunk_end)
+            with transaction.atomic():
+                # Days without meals or workouts go back to NULL, as in
+                # progress.rollups; the upsert below sets the rest
+                clear_days(ProgressEntry.objects.filter(date__range=span))
+                totals = daily_totals(
+                    Meal.objects.filter(date__range=span),
+                    Workout.objects.filter(date__range=span),
+                )
+                upsert_totals(totals, batch_size=options['batch_size'])
+            written += len(totals)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{chunk_start} to {chunk_end}: {len(totals)} days')
+            chunk_start = chunk_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} user-days from {start} to {end} in {time.monotonic() - started:.1f}s'
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+FIELDS = ['weight', 'calories_consumed', 'workouts_completed']
+
+
+def merge_duplicate_days(apps, schema_editor):
+    """
+    Collapse entries sharing a (user, date) before the constraint is added.
+
+    The newest entry is kept; any field it leaves empty is filled from the
+    older entries, newest first.
+    """
+    ProgressEntry = apps.get_model('progress', 'ProgressEntry')
+    duplicates = (
+        ProgressEntry.objects.values('user_id', 'date')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    for group in duplicates.iterator():
+        entries = list(
+            ProgressEntry.objects.filter(user_id=group['user_id'], date=group['date']).order_by('-id')
+        )
+        keep = entries[0]
+        for older in entries[1:]:
+            for field in FIELDS:
+                if getattr(keep, field) is None:
+                    setattr(keep, field, getattr(older, field))
+        keep.save(update_fields=FIELDS)
+        ProgressEntry.objects.filter(pk__in=[entry.pk for entry in entries[1:]]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0002_remove_bodymeasurement_arms_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_days, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='progressentry',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='unique_user_progress_date'),
+        ),
+    ]
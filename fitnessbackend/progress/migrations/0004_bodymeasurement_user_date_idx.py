@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0003_progressentry_unique_user_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bodymeasurement',
+            index=models.Index(fields=['user', 'date'], name='progress_bo_user_id_4a2ace_idx'),
+        ),
+    ]
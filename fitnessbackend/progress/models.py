@@ -11,6 +11,9 @@ class ProgressEntry(models.Model):
     class Meta:
         ordering = ['-date']
         verbose_name_plural = 'Progress Entries'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_user_progress_date'),
+        ]
 
 class BodyMeasurement(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -23,3 +26,6 @@ class BodyMeasurement(models.Model):
     
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['user', 'date']),
+        ]
@@ -0,0 +1,92 @@
+"""
+Daily calories_consumed and workouts_completed on ProgressEntry.
+
+Both values are derived from Meal and Workout rows. A day with at least
+one meal or workout has both set (0 for the kind it has none of); a day
+with neither has both NULL, whether or not it has a weight. The
+incremental paths below and rebuild_progress_rollups all produce exactly
+that.
+
+A new meal or workout is folded in with a single INSERT ... ON CONFLICT
+statement that creates the day's entry or increments it in place. Updates
+and deletes can empty a day, so they recompute the affected days from the
+source tables; deletes only update existing entries, so cascading deletes
+never recreate one.
+"""
+from django.db import connection
+from django.db.models import Count, Sum
+from nutrition.models import Meal
+from workouts.models import Workout
+from .models import ProgressEntry
+
+ROLLUP_FIELDS = ['calories_consumed', 'workouts_completed']
+
+_table = ProgressEntry._meta.db_table
+UPSERT_DELTA_SQL = (
+    f'INSERT INTO {_table} (user_id, date, calories_consumed, workouts_completed) '
+    'VALUES (%s, %s, %s, %s) '
+    'ON CONFLICT (user_id, date) DO UPDATE SET '
+    f'calories_consumed = COALESCE({_table}.calories_consumed, 0) + excluded.calories_consumed, '
+    f'workouts_completed = COALESCE({_table}.workouts_completed, 0) + excluded.workouts_completed'
+)
+
+
+def add_to_day(user_id, day, calories=0, workouts=0):
+    """Create or increment the day's entry in one statement"""
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_DELTA_SQL, [user_id, day, calories, workouts])
+
+
+def daily_totals(meals, workouts):
+    """Map (user_id, date) to rollup values from filtered Meal and Workout querysets"""
+    totals = {}
+    for row in meals.values('user_id', 'date').annotate(total=Sum('calories')).order_by():
+        totals.setdefault((row['user_id'], row['date']), [0, 0])[0] = row['total']
+    for row in workouts.values('user_id', 'date').annotate(total=Count('id')).order_by():
+        totals.setdefault((row['user_id'], row['date']), [0, 0])[1] = row['total']
+    return totals
+
+
+def upsert_totals(totals, batch_size=1000):
+    """Write rollups for many days, keeping any weight already recorded"""
+    ProgressEntry.objects.bulk_create(
+        [
+            ProgressEntry(user_id=user_id, date=day, calories_consumed=calories, workouts_completed=workouts)
+            for (user_id, day), (calories, workouts) in totals.items()
+        ],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['user', 'date'],
+        update_fields=ROLLUP_FIELDS,
+    )
+
+
+def clear_days(queryset):
+    """Reset rollups to NULL on entries whose day has no meals or workouts"""
+    return queryset.update(**{field: None for field in ROLLUP_FIELDS})
+
+
+def refresh_days(user_id, days, create=True):
+    """
+    Recompute the given days for one user from the source tables.
+
+    With create=False only existing entries are updated, which is what a
+    delete needs: its user may be in the middle of a cascading delete.
+    """
+    days = {day for day in days if day is not None}
+    if not days:
+        return
+    totals = daily_totals(
+        Meal.objects.filter(user_id=user_id, date__in=days),
+        Workout.objects.filter(user_id=user_id, date__in=days),
+    )
+    clear_days(ProgressEntry.objects.filter(
+        user_id=user_id, date__in=[day for day in days if (user_id, day) not in totals]
+    ))
+    if create:
+        upsert_totals(totals)
+        return
+    for (_, day), (calories, workouts) in totals.items():
+        ProgressEntry.objects.filter(user_id=user_id, date=day).update(
+            calories_consumed=calories, workouts_completed=workouts
+        )
@@ -5,7 +5,15 @@ class ProgressEntrySerializer(serializers.ModelSerializer):
     class Meta:
         model = ProgressEntry
         fields = ['id', 'date', 'weight', 'calories_consumed', 'workouts_completed']
-        
+        # Maintained from meals and workouts, see progress.rollups
+        read_only_fields = ['calories_consumed', 'workouts_completed']
+
+    def validate_date(self, value):
+        others = ProgressEntry.objects.filter(user=self.context['request'].user, date=value)
+        if self.instance is not None and others.exclude(pk=self.instance.pk).exists():
+            raise serializers.ValidationError("There is already an entry for this date")
+        return value
+
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
@@ -0,0 +1,80 @@
+"""
+Load per-user time series as NumPy arrays.
+
+Series are grouped by the table they live in, and each table is read once
+with a single ``values_list`` covering every requested column. Weight is
+recorded both on ProgressEntry and in workouts.WeightEntry; the two are
+merged, averaging days that appear in both.
+"""
+import numpy as np
+from workouts.models import WeightEntry
+from .models import BodyMeasurement, ProgressEntry
+
+SERIES_SOURCES = {
+    'weight': ProgressEntry,
+    'calories_consumed': ProgressEntry,
+    'workouts_completed': ProgressEntry,
+    'chest': BodyMeasurement,
+    'waist': BodyMeasurement,
+    'hips': BodyMeasurement,
+    'biceps': BodyMeasurement,
+    'thighs': BodyMeasurement,
+}
+MEASUREMENT_FIELDS = ['chest', 'waist', 'hips', 'biceps', 'thighs']
+
+
+def _fetch(model, user, fields, start, end):
+    queryset = model.objects.filter(user=user)
+    if start is not None:
+        queryset = queryset.filter(date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(date__lte=end)
+    rows = list(queryset.order_by('date').values_list('date', *fields))
+    dates = np.array([row[0] for row in rows], dtype='datetime64[D]')
+    values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(fields))
+    return dates, values
+
+
+def _present(dates, values):
+    mask = ~np.isnan(values)
+    return dates[mask], values[mask]
+
+
+def _merge_by_date(dates, values):
+    """Sort by date and average values that share a date"""
+    unique, inverse = np.unique(dates, return_inverse=True)
+    totals = np.bincount(inverse, weights=values, minlength=len(unique))
+    counts = np.bincount(inverse, minlength=len(unique))
+    return unique, totals / counts
+
+
+def load_series(user, names, start=None, end=None):
+    """
+    Return ``{name: (dates, values)}`` for the requested series.
+
+    ``dates`` is a sorted ``datetime64[D]`` array and ``values`` a float
+    array of the same length; days without a value are omitted.
+    """
+    unknown = [name for name in names if name not in SERIES_SOURCES]
+    if unknown:
+        raise KeyError(', '.join(unknown))
+
+    by_model = {}
+    for name in names:
+        by_model.setdefault(SERIES_SOURCES[name], []).append(name)
+
+    series = {}
+    for model, fields in by_model.items():
+        dates, values = _fetch(model, user, fields, start, end)
+        for column, name in enumerate(fields):
+            series[name] = _present(dates, values[:, column])
+
+    if 'weight' in series:
+        extra_dates, extra_values = _fetch(WeightEntry, user, ['weight'], start, end)
+        extra_dates, extra_values = _present(extra_dates, extra_values[:, 0])
+        dates, values = series['weight']
+        series['weight'] = _merge_by_date(
+            np.concatenate([dates, extra_dates]),
+            np.concatenate([values, extra_values]),
+        )
+    return series
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from nutrition.models import Meal
+from users.snapshots import schedule_refresh
+from workouts.models import Workout
+from .rollups import add_to_day, refresh_days
+
+
+@receiver(post_save, sender=Meal)
+def meal_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        add_to_day(instance.user_id, instance.date, calories=instance.calories)
+    else:
+        refresh_days(instance.user_id, {instance.date, getattr(instance, '_previous_date', None)})
+    schedule_refresh(instance.user_id)
+
+
+@receiver(post_delete, sender=Meal)
+def meal_deleted(sender, instance, **kwargs):
+    refresh_days(instance.user_id, {instance.date}, create=False)
+    schedule_refresh(instance.user_id)
+
+
+@receiver(post_save, sender=Workout)
+def workout_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        add_to_day(instance.user_id, instance.date, workouts=1)
+    else:
+        refresh_days(instance.user_id, {instance.date, getattr(instance, '_previous_date', None)})
+    schedule_refresh(instance.user_id)
+
+
+@receiver(post_delete, sender=Workout)
+def workout_deleted(sender, instance, **kwargs):
+    refresh_days(instance.user_id, {instance.date}, create=False)
+    schedule_refresh(instance.user_id)
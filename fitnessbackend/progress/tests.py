@@ -1,3 +1,77 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from nutrition.models import Meal
+from rest_framework.test import APIClient
+from users.models import User
+from workouts.models import Exercise, Workout
+from .models import ProgressEntry
+
+
+class RollupRebuildTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pass12345')
+        self.exercise = Exercise.objects.create(
+            name='Deadlift', description='', muscle_group='Back', equipment='Barbell', instructions=''
+        )
+
+    def meal(self, day, calories=500):
+        return Meal.objects.create(user=self.user, food='Rice', meal_type='Lunch', calories=calories, date=day)
+
+    def rollups(self):
+        return list(
+            ProgressEntry.objects.filter(user=self.user).order_by('date')
+            .values_list('date', 'weight', 'calories_consumed', 'workouts_completed')
+        )
+
+    def test_rebuild_matches_incremental_rollups(self):
+        ProgressEntry.objects.create(user=self.user, date=date(2024, 1, 1), weight=80)
+        self.meal(date(2024, 1, 2))
+        Workout.objects.create(user=self.user, exercise=self.exercise, sets=3, reps=5, date=date(2024, 1, 3))
+        self.meal(date(2024, 1, 4)).delete()
+        ProgressEntry.objects.create(user=self.user, date=date(2024, 1, 5), weight=79.5)
+        self.meal(date(2024, 1, 5), calories=0).delete()
+        moved = self.meal(date(2024, 1, 6))
+        moved.date = date(2024, 1, 7)
+        moved.save()
+
+        incremental = self.rollups()
+        self.assertEqual(incremental, [
+            (date(2024, 1, 1), 80, None, None),
+            (date(2024, 1, 2), None, 500, 0),
+            (date(2024, 1, 3), None, 0, 1),
+            (date(2024, 1, 4), None, None, None),
+            (date(2024, 1, 5), 79.5, None, None),
+            (date(2024, 1, 6), None, None, None),
+            (date(2024, 1, 7), None, 500, 0),
+        ])
+
+        call_command('rebuild_progress_rollups', stdout=StringIO())
+        self.assertEqual(self.rollups(), incremental)
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='scaler', password='pass12345')
+        ProgressEntry.objects.bulk_create([
+            ProgressEntry(user=user, date=date(2024, 1, 1) + timedelta(days=i), weight=80 - i / 10)
+            for i in range(60)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def encoding(self, accept_encoding):
+        response = self.client.get('/api/progress/progress/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        self.assertEqual(response.status_code, 200)
+        return response.get('Content-Encoding')
+
+    def test_gzip_is_used_when_accepted(self):
+        self.assertEqual(self.encoding('gzip'), 'gzip')
+        self.assertEqual(self.encoding('br;q=0, gzip'), 'gzip')
 
-# Create your tests here.
+    def test_refused_codings_are_not_used(self):
+        self.assertIsNone(self.encoding('gzip;q=0'))
+        self.assertIsNone(self.encoding('gzip;q=0, br;q=0, identity'))
+        self.assertIsNone(self.encoding('*;q=0'))
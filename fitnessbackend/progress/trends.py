@@ -0,0 +1,103 @@
+"""
+Smoothed trend, weekly rate of change and date-to-target projection.
+
+Observations are irregular, so each series is first interpolated onto a
+daily grid. The EMA runs over that grid in fixed-size blocks: inside a
+block the recurrence is evaluated in closed form with cumulative sums, and
+only the carry between blocks is a Python step. Blocks are sized so the
+powers of (1 - alpha) involved never overflow.
+"""
+import numpy as np
+
+DEFAULT_ALPHA = 0.1
+DEFAULT_WINDOW = 28
+# Slopes below this share of the fitted value per day are fitting noise on
+# a flat series; projections further out than the horizon are not given
+FLAT_SLOPE = 1e-9
+MAX_PROJECTION_DAYS = 5 * 365
+
+
+def ema(values, alpha):
+    """Exponential moving average seeded with the first value"""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.empty_like(values)
+    if not len(values):
+        return result
+    if alpha >= 1:
+        result[:] = values
+        return result
+
+    decay = 1.0 - alpha
+    block = int(min(1024, max(1, 100 / -np.log10(decay))))
+    powers = decay ** np.arange(block + 1)
+    inverse = 1.0 / powers[:-1]
+
+    result[0] = carry = values[0]
+    for start in range(1, len(values), block):
+        chunk = values[start:start + block]
+        size = len(chunk)
+        weighted = np.cumsum(chunk * inverse[:size]) * powers[:size]
+        result[start:start + size] = powers[1:size + 1] * carry + alpha * weighted
+        carry = result[start + size - 1]
+    return result
+
+
+def daily_grid(dates, values):
+    """Interpolate observations onto one point per day between the first and last"""
+    days = np.arange(dates[0], dates[-1] + np.timedelta64(1, 'D'))
+    offsets = (dates - dates[0]).astype(np.int64)
+    return days, np.interp(np.arange(len(days)), offsets, values)
+
+
+def weekly_change(trend):
+    """Change in trend over the previous seven days; NaN for the first week"""
+    change = np.full(len(trend), np.nan)
+    change[7:] = trend[7:] - trend[:-7]
+    return change
+
+
+def linear_fit(dates, values, window):
+    """Least-squares slope per day and fitted value at the last date over the trailing window"""
+    recent = dates >= dates[-1] - np.timedelta64(window - 1, 'D')
+    x = (dates[recent] - dates[-1]).astype(np.float64)
+    y = values[recent]
+    if len(x) < 2:
+        return None, None
+    slope, intercept = np.polyfit(x, y, 1)
+    return slope, intercept
+
+
+def _rounded(array, digits=3):
+    return [None if np.isnan(value) else round(float(value), digits) for value in array]
+
+
+def analyze(dates, values, alpha=DEFAULT_ALPHA, window=DEFAULT_WINDOW, target=None):
+    """Trend analysis for one series, aligned to the observed dates"""
+    if not len(dates):
+        return {'dates': [], 'values': [], 'trend': [], 'weekly_change': [],
+                'current': None, 'weekly_rate': None, 'projection': None}
+
+    days, grid = daily_grid(dates, values)
+    trend = ema(grid, alpha)
+    change = weekly_change(trend)
+    observed = (dates - days[0]).astype(np.int64)
+    slope, fitted = linear_fit(dates, values, window)
+
+    projection = None
+    if target is not None:
+        projection = {'target': target, 'date': None, 'days': None}
+        if slope is not None and abs(slope) > FLAT_SLOPE * max(1.0, abs(fitted)):
+            remaining = (target - fitted) / slope
+            if 0 <= remaining <= MAX_PROJECTION_DAYS:
+                projection['days'] = int(np.ceil(remaining))
+                projection['date'] = str(dates[-1] + np.timedelta64(projection['days'], 'D'))
+
+    return {
+        'dates': [str(day) for day in dates],
+        'values': _rounded(values),
+        'trend': _rounded(trend[observed]),
+        'weekly_change': _rounded(change[observed]),
+        'current': round(float(trend[-1]), 3),
+        'weekly_rate': None if slope is None else round(float(slope) * 7, 3),
+        'projection': projection,
+    }
@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProgressEntryViewSet, BodyMeasurementViewSet
+from .views import ProgressEntryViewSet, BodyMeasurementViewSet, SeriesViewSet, TrendViewSet
 
 router = DefaultRouter()
 router.register(r'progress', ProgressEntryViewSet, basename='progress')
 router.register(r'measurements', BodyMeasurementViewSet, basename='measurements')
+router.register(r'series', SeriesViewSet, basename='series')
+router.register(r'trends', TrendViewSet, basename='trends')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,12 +1,71 @@
 from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from datetime import date
+from config.compact import CompactResponseMixin
+import numpy as np
 from django.db.models import Avg
+from .downsample import downsample_rows, lttb_indices
 from .models import ProgressEntry, BodyMeasurement
 from .serializers import ProgressEntrySerializer, BodyMeasurementSerializer
+from .series import MEASUREMENT_FIELDS, SERIES_SOURCES, load_series
+from . import trends
 
-class ProgressEntryViewSet(viewsets.ModelViewSet):
+def max_points_param(request):
+    max_points = request.query_params.get('max_points')
+    if max_points is None:
+        return None
+    try:
+        max_points = int(max_points)
+    except ValueError:
+        max_points = 0
+    if max_points < 3:
+        raise ValidationError({"max_points": "max_points must be an integer of at least 3"})
+    return max_points
+
+
+def history_response(request, rows, fields):
+    """Return history rows, downsampled when ?max_points is given"""
+    max_points = max_points_param(request)
+    if max_points is not None:
+        rows = downsample_rows(rows, fields, max_points)
+    return Response(list(rows), status=status.HTTP_200_OK)
+
+
+def query_date(request, param):
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({param: "Enter a date as YYYY-MM-DD"})
+
+
+def query_number(request, param, default=None, cast=float):
+    value = request.query_params.get(param)
+    if value in (None, ''):
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValidationError({param: "Enter a number"})
+
+
+def query_series(request, default):
+    value = request.query_params.get('series')
+    names = [name.strip() for name in value.split(',') if name.strip()] if value else list(default)
+    unknown = [name for name in names if name not in SERIES_SOURCES]
+    if unknown or not names:
+        raise ValidationError({
+            'series': f"Choose from {', '.join(SERIES_SOURCES)}"
+        })
+    return list(dict.fromkeys(names))
+
+
+class ProgressEntryViewSet(CompactResponseMixin, viewsets.ModelViewSet):
     """
     Routes (when progress.urls is included at /api/progress/ and router.register('progress', ...)):
     - GET  /api/progress/progress/                     -> list
@@ -17,6 +76,12 @@ class ProgressEntryViewSet(viewsets.ModelViewSet):
     - GET  /api/progress/progress/weight_history/      -> weight history (date, weight)
     - GET  /api/progress/progress/nutrition_history/   -> nutrition history (date, calories_consumed)
     - GET  /api/progress/progress/workout_history/     -> workout history (date, workouts_completed)
+
+    calories_consumed and workouts_completed are derived from meals and
+    workouts; posting an entry for a day that already has one updates it.
+
+    The history routes accept ?max_points=N to downsample the series (LTTB),
+    and every route can answer in columnar JSON or MessagePack (config.compact).
     """
     serializer_class = ProgressEntrySerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -25,25 +90,30 @@ class ProgressEntryViewSet(viewsets.ModelViewSet):
         return ProgressEntry.objects.filter(user=self.request.user).order_by('date')
 
     def perform_create(self, serializer):
+        # Meals and workouts may already have created the day's entry
+        serializer.instance = ProgressEntry.objects.filter(
+            user=self.request.user, date=serializer.validated_data['date']
+        ).first()
         serializer.save(user=self.request.user)
 
     @action(detail=False, methods=['get'], url_path='weight_history')
     def weight_history(self, request):
-        qs = self.get_queryset().values('date', 'weight')
-        return Response(qs, status=status.HTTP_200_OK)
+        # Days created by meal and workout rollups carry no weight
+        qs = self.get_queryset().filter(weight__isnull=False).values('date', 'weight')
+        return history_response(request, qs, ['weight'])
 
     @action(detail=False, methods=['get'], url_path='nutrition_history')
     def nutrition_history(self, request):
         qs = self.get_queryset().values('date', 'calories_consumed')
-        return Response(qs, status=status.HTTP_200_OK)
+        return history_response(request, qs, ['calories_consumed'])
 
     @action(detail=False, methods=['get'], url_path='workout_history')
     def workout_history(self, request):
         qs = self.get_queryset().values('date', 'workouts_completed')
-        return Response(qs, status=status.HTTP_200_OK)
+        return history_response(request, qs, ['workouts_completed'])
 
 
-class BodyMeasurementViewSet(viewsets.ModelViewSet):
+class BodyMeasurementViewSet(CompactResponseMixin, viewsets.ModelViewSet):
     """
     Routes:
     - GET  /api/progress/measurements/
@@ -51,7 +121,7 @@ class BodyMeasurementViewSet(viewsets.ModelViewSet):
     - GET  /api/progress/measurements/{pk}/
     - PUT  /api/progress/measurements/{pk}/
     - DELETE /api/progress/measurements/{pk}/
-    - GET  /api/progress/measurements/measurement_history/
+    - GET  /api/progress/measurements/measurement_history/  (accepts ?max_points=N)
     """
     serializer_class = BodyMeasurementSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -64,5 +134,79 @@ class BodyMeasurementViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='measurement_history')
     def measurement_history(self, request):
-        qs = self.get_queryset().values('date', 'chest', 'waist', 'hips', 'biceps', 'thighs')
-        return Response(qs, status=status.HTTP_200_OK)
+        fields = MEASUREMENT_FIELDS
+        qs = self.get_queryset().values('date', *fields)
+        return history_response(request, qs, fields)
+
+
+class TrendViewSet(CompactResponseMixin, viewsets.ViewSet):
+    """
+    Routes:
+    - GET  /api/progress/trends/
+
+    Query parameters:
+    - series: comma-separated names (default: weight and all body measurements)
+    - date_from, date_to: YYYY-MM-DD bounds
+    - alpha: EMA smoothing factor in (0, 1] (default 0.1)
+    - window: days of history used for the regression (default 28)
+    - target_<series>: goal value to project a date for, e.g. target_weight=75
+
+    Weight merges ProgressEntry and WeightEntry. Each series reports its
+    observations, the EMA trend and seven-day change at those dates, the
+    regression rate per week and, with a target, the projected date.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        names = query_series(request, ['weight', *MEASUREMENT_FIELDS])
+        alpha = query_number(request, 'alpha', trends.DEFAULT_ALPHA)
+        if not 0 < alpha <= 1:
+            raise ValidationError({'alpha': "alpha must be in (0, 1]"})
+        window = query_number(request, 'window', trends.DEFAULT_WINDOW, cast=int)
+        if window < 2:
+            raise ValidationError({'window': "window must be at least 2 days"})
+
+        series = load_series(
+            request.user, names,
+            start=query_date(request, 'date_from'),
+            end=query_date(request, 'date_to'),
+        )
+        return Response({
+            name: trends.analyze(
+                dates, values, alpha=alpha, window=window,
+                target=query_number(request, f'target_{name}'),
+            )
+            for name, (dates, values) in series.items()
+        }, status=status.HTTP_200_OK)
+
+
+class SeriesViewSet(CompactResponseMixin, viewsets.ViewSet):
+    """
+    Routes:
+    - GET  /api/progress/series/?series=weight,calories_consumed&date_from=&date_to=
+
+    Returns every requested series in one response as parallel arrays,
+    {"<name>": {"dates": [...], "values": [...]}}, reading each underlying
+    table once. Weight merges ProgressEntry and WeightEntry. Accepts
+    ?max_points=N to downsample each series (LTTB).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        names = query_series(request, SERIES_SOURCES)
+        max_points = max_points_param(request)
+        series = load_series(
+            request.user, names,
+            start=query_date(request, 'date_from'),
+            end=query_date(request, 'date_to'),
+        )
+
+        data = {}
+        for name, (dates, values) in series.items():
+            if max_points is not None:
+                keep = lttb_indices(dates.astype(np.float64), values, max_points)
+                dates, values = dates[keep], values[keep]
+            if SERIES_SOURCES[name]._meta.get_field(name).get_internal_type() == 'IntegerField':
+                values = values.astype(np.int64)
+            data[name] = {'dates': [str(day) for day in dates], 'values': values.tolist()}
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,126 @@
+"""
+Recent-activity feed merged across workouts, meals, goals, progress
+entries and body measurements.
+
+Every item has the key (date, source rank, id) and the feed runs in
+descending key order. Each source is read newest-first with
+``ORDER BY ... LIMIT page_size`` on a (user, date) index, starting just
+below the cursor, and the per-source streams are combined lazily with
+``heapq.merge``. A page therefore costs at most page_size rows from each
+source, however long the user's history is.
+"""
+import base64
+import heapq
+import json
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+from django.db.models import Q
+from django.utils import timezone
+from goals.models import Goal
+from nutrition.models import Meal
+from progress.models import BodyMeasurement, ProgressEntry
+from workouts.models import Workout
+
+
+class Source:
+    def __init__(self, name, model, fields, date_field='date', ordering=('-date', '-id')):
+        self.name = name
+        self.model = model
+        self.fields = fields
+        self.date_field = date_field
+        self.ordering = ordering
+
+    def before(self, day):
+        return Q(**{f'{self.date_field}__lt': day})
+
+    def through(self, day):
+        return Q(**{f'{self.date_field}__lte': day})
+
+    def on(self, day):
+        return Q(**{self.date_field: day})
+
+    def item_date(self, row):
+        return row[self.date_field]
+
+
+class CreatedSource(Source):
+    """A source dated by a DateTimeField, bucketed into local days"""
+
+    def __init__(self, name, model, fields):
+        super().__init__(name, model, fields, date_field='created_at', ordering=('-created_at', '-id'))
+
+    def _bounds(self, day):
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        return start, start + timedelta(days=1)
+
+    def before(self, day):
+        return Q(created_at__lt=self._bounds(day)[0])
+
+    def through(self, day):
+        return Q(created_at__lt=self._bounds(day)[1])
+
+    def on(self, day):
+        start, end = self._bounds(day)
+        return Q(created_at__gte=start, created_at__lt=end)
+
+    def item_date(self, row):
+        return timezone.localtime(row['created_at']).date()
+
+
+SOURCES = [
+    CreatedSource('goal', Goal, ['id', 'title', 'category', 'target', 'status', 'created_at']),
+    Source('measurement', BodyMeasurement, ['id', 'date', 'chest', 'waist', 'hips', 'biceps', 'thighs']),
+    Source('progress', ProgressEntry, ['id', 'date', 'weight', 'calories_consumed', 'workouts_completed']),
+    Source('meal', Meal, ['id', 'date', 'food', 'meal_type', 'calories']),
+    Source('workout', Workout, ['id', 'date', 'exercise__name', 'sets', 'reps', 'weight', 'duration']),
+]
+
+
+def encode_cursor(key):
+    day, rank, pk = key
+    raw = json.dumps([day.isoformat(), rank, pk], separators=(',', ':')).encode('ascii')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(encoded):
+    """Return (date, rank, id), or raise ValueError"""
+    try:
+        day, rank, pk = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        return date.fromisoformat(day), int(rank), int(pk)
+    except (TypeError, ValueError, UnicodeEncodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def _seek(source, rank, cursor):
+    """Rows of this source whose key sorts strictly below the cursor"""
+    day, cursor_rank, pk = cursor
+    if rank < cursor_rank:
+        return source.through(day)
+    if rank > cursor_rank:
+        return source.before(day)
+    return source.before(day) | (source.on(day) & Q(id__lt=pk))
+
+
+def _stream(user, rank, source, cursor, limit):
+    queryset = source.model.objects.filter(user=user)
+    if cursor is not None:
+        queryset = queryset.filter(_seek(source, rank, cursor))
+    for row in queryset.order_by(*source.ordering).values(*source.fields)[:limit]:
+        day = source.item_date(row)
+        item = {'type': source.name, **row, 'date': day}
+        if 'exercise__name' in item:
+            item['exercise'] = item.pop('exercise__name')
+        yield (day, rank, row['id']), item
+
+
+def activity_page(user, cursor=None, limit=20):
+    """Return (items, next_cursor) for one page of the feed"""
+    streams = [
+        _stream(user, rank, source, cursor, limit + 1)
+        for rank, source in enumerate(SOURCES)
+    ]
+    merged = list(islice(heapq.merge(*streams, key=lambda entry: entry[0], reverse=True), limit + 1))
+    page = merged[:limit]
+    next_cursor = encode_cursor(page[-1][0]) if len(merged) > limit else None
+    return [item for _, item in page], next_cursor
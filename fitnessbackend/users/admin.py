@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from .models import RevokedToken, User
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -26,3 +26,9 @@ class CustomUserAdmin(UserAdmin):
         )
     )
 # Register your models here.
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ('jti', 'expires_at')
+    search_fields = ('jti',)
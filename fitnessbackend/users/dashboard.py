@@ -0,0 +1,55 @@
+"""
+Cached dashboard statistics.
+
+The numbers come from two queries: conditional aggregates over the user's
+workouts for the last seven days, and today's calories from meals. The
+result is cached per user and dropped by Workout and Meal signals; the
+cached copy also records the day it was computed for, so it never
+outlives midnight.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from nutrition.models import Meal
+from workouts.models import Workout
+
+DASHBOARD_TIMEOUT = 60 * 60
+# Used for workouts without a recorded duration: one set plus rest
+MINUTES_PER_SET = 3
+
+
+def _key(user_id):
+    return f'dashboard-stats:{user_id}'
+
+
+def compute_dashboard_stats(user_id, today):
+    week_start = today - timedelta(days=6)
+    workouts = Workout.objects.filter(user_id=user_id, date__gte=week_start, date__lte=today).aggregate(
+        today_workouts=Count('id', filter=Q(date=today)),
+        weekly_workouts=Count('id'),
+        active_minutes=Sum(Coalesce('duration', F('sets') * MINUTES_PER_SET)),
+    )
+    calories = Meal.objects.filter(user_id=user_id, date=today).aggregate(total=Sum('calories'))['total']
+    return {
+        'todayWorkouts': workouts['today_workouts'],
+        'calories': calories or 0,
+        'weeklyWorkouts': workouts['weekly_workouts'],
+        'activeMinutes': workouts['active_minutes'] or 0,
+    }
+
+
+def dashboard_stats_for(user_id):
+    today = timezone.now().date()
+    cached = cache.get(_key(user_id))
+    if cached is not None and cached['date'] == today.isoformat():
+        return cached['stats']
+    stats = compute_dashboard_stats(user_id, today)
+    cache.set(_key(user_id), {'date': today.isoformat(), 'stats': stats}, timeout=DASHBOARD_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard(user_id):
+    cache.delete(_key(user_id))
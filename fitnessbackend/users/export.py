@@ -0,0 +1,119 @@
+"""
+Streaming account export as NDJSON or a zip of CSV files.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` and encoded
+as they arrive; output is handed to the response in blocks of roughly
+``FLUSH_BYTES``. Neither format holds more than one chunk of rows in
+memory, whatever the size of the account. The zip is written to an
+unseekable buffer, so zipfile emits data descriptors instead of seeking
+back to patch headers, and each flushed block can be sent immediately.
+"""
+import csv
+import io
+import zipfile
+
+from django.core.serializers.json import DjangoJSONEncoder
+from goals.models import Goal
+from nutrition.models import Meal
+from progress.models import BodyMeasurement, ProgressEntry
+from workouts.models import WeightEntry, Workout
+
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+EXPORTS = {
+    'workouts': (Workout, [
+        'id', 'date', 'exercise__name', 'sets', 'reps', 'weight', 'duration', 'notes', 'created_at',
+    ]),
+    'weight_entries': (WeightEntry, ['id', 'date', 'weight']),
+    'meals': (Meal, [
+        'id', 'date', 'meal_type', 'food', 'food_item_id', 'servings',
+        'calories', 'protein', 'carbs', 'fats', 'notes', 'created_at', 'updated_at',
+    ]),
+    'goals': (Goal, [
+        'id', 'title', 'description', 'category', 'target', 'current', 'unit',
+        'start_date', 'end_date', 'status', 'created_at', 'updated_at',
+    ]),
+    'progress_entries': (ProgressEntry, [
+        'id', 'date', 'weight', 'calories_consumed', 'workouts_completed',
+    ]),
+    'measurements': (BodyMeasurement, [
+        'id', 'date', 'chest', 'waist', 'hips', 'biceps', 'thighs',
+    ]),
+}
+
+
+def headers(lookups):
+    return [lookup.split('__')[0] for lookup in lookups]
+
+
+def iter_rows(user, name):
+    model, lookups = EXPORTS[name]
+    return (
+        model.objects.filter(user=user)
+        .order_by('id')
+        .values_list(*lookups)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+def stream_ndjson(user, names):
+    """Yield one JSON object per row, tagged with its dataset"""
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    pending = []
+    size = 0
+    for name in names:
+        columns = ['type', *headers(EXPORTS[name][1])]
+        for row in iter_rows(user, name):
+            line = encoder.encode(dict(zip(columns, (name, *row)))) + '\n'
+            pending.append(line)
+            size += len(line)
+            if size >= FLUSH_BYTES:
+                yield ''.join(pending).encode()
+                pending = []
+                size = 0
+    if pending:
+        yield ''.join(pending).encode()
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only sink whose contents are drained after every flush"""
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+def stream_csv_zip(user, names):
+    """Yield a zip archive holding one CSV file per dataset"""
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name in names:
+            with archive.open(f'{name}.csv', 'w', force_zip64=True) as entry:
+                text = io.TextIOWrapper(entry, encoding='utf-8', newline='')
+                writer = csv.writer(text)
+                writer.writerow(headers(EXPORTS[name][1]))
+                for count, row in enumerate(iter_rows(user, name), start=1):
+                    writer.writerow(row)
+                    if count % CHUNK_SIZE == 0:
+                        text.flush()
+                        if buffer.size >= FLUSH_BYTES:
+                            yield buffer.drain()
+                text.flush()
+                text.detach()
+            yield buffer.drain()
+    yield buffer.drain()
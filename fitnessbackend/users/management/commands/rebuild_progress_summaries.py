@@ -0,0 +1,62 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from users.models import User
+
+
+def init_worker():
+    """Set up Django in workers started with spawn; forked workers already have it"""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def refresh_chunk(user_ids, today):
+    from users.snapshots import refresh_summaries
+    try:
+        return len(refresh_summaries(user_ids, today))
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Recompute every progress summary snapshot, in chunks of users across a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes; 1 runs in this process')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        workers = options['workers']
+        if chunk_size <= 0 or workers <= 0:
+            raise CommandError('--chunk-size and --workers must be positive')
+
+        today = timezone.now().date()
+        user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        chunks = [user_ids[start:start + chunk_size] for start in range(0, len(user_ids), chunk_size)]
+        started = time.monotonic()
+        written = 0
+
+        if workers == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                written += refresh_chunk(chunk, today)
+        else:
+            # Connections must not be shared with forked children
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+                futures = [pool.submit(refresh_chunk, chunk, today) for chunk in chunks]
+                for future in as_completed(futures):
+                    written += future.result()
+                    if options['verbosity'] > 1:
+                        self.stdout.write(f'{written}/{len(user_ids)} users')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} progress summaries in {time.monotonic() - started:.1f}s'
+        ))
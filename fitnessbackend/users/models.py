@@ -14,3 +14,31 @@ class User(AbstractUser):
     
     def __str__(self):
         return self.username
+
+
+class ProgressSummary(models.Model):
+    """Precomputed week-over-week and month-over-month progress, one row per user"""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='progress_summary'
+    )
+    as_of = models.DateField()
+    data = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Progress summaries'
+
+    def __str__(self):
+        return f"{self.user_id}'s progress summary ({self.as_of})"
+
+
+class RevokedToken(models.Model):
+    """A token jti rejected until the token would have expired anyway"""
+    jti = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
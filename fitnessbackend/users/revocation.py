@@ -0,0 +1,89 @@
+"""
+Revoked token ids (jti), checked on every authenticated request and refresh.
+
+Revocations are written to the RevokedToken table and each process keeps
+the unexpired jtis in a frozenset, so a check is one set lookup on the
+token's own jti string. The set is loaded from the table on first use and
+shared through the cache (see CACHES in settings) under a version token
+that every revocation replaces. The revoking process applies its own
+revocations at once; every other process compares versions at most every
+``sync_interval`` seconds, so a revoked token is accepted by another
+worker for at most 5 seconds. If the cache loses the version, processes
+reload from the table, which stays the source of truth.
+"""
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from .models import RevokedToken
+
+REVOKED_CACHE_TIMEOUT = 24 * 60 * 60
+_VERSION_KEY = 'revoked-jti:version'
+
+
+def _token_expiry(token):
+    return datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+
+
+class RevocationStore:
+    sync_interval = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked = frozenset()
+        self._version = None
+        self._next_sync = 0.0
+
+    def is_revoked(self, jti):
+        if time.monotonic() >= self._next_sync:
+            self._sync()
+        return jti in self._revoked
+
+    def revoke(self, *tokens):
+        """Revoke validated tokens until they expire"""
+        now = timezone.now()
+        rows = {
+            token[api_settings.JTI_CLAIM]: RevokedToken(
+                jti=token[api_settings.JTI_CLAIM], expires_at=_token_expiry(token)
+            )
+            for token in tokens
+        }
+        RevokedToken.objects.filter(expires_at__lte=now).delete()
+        RevokedToken.objects.bulk_create(rows.values(), ignore_conflicts=True)
+        cache.set(_VERSION_KEY, time.time_ns(), timeout=REVOKED_CACHE_TIMEOUT)
+        with self._lock:
+            self._revoked = self._revoked.union(rows)
+
+    def clear(self):
+        with self._lock:
+            self._revoked = frozenset()
+            self._version = None
+            self._next_sync = 0.0
+
+    def _sync(self):
+        with self._lock:
+            if time.monotonic() < self._next_sync:
+                return
+            version = cache.get(_VERSION_KEY)
+            if version is None:
+                version = time.time_ns()
+                if not cache.add(_VERSION_KEY, version, timeout=REVOKED_CACHE_TIMEOUT):
+                    version = cache.get(_VERSION_KEY, version)
+            if version != self._version:
+                key = f'revoked-jti:{version}'
+                jtis = cache.get(key)
+                if jtis is None:
+                    jtis = list(
+                        RevokedToken.objects.filter(expires_at__gt=timezone.now())
+                        .values_list('jti', flat=True)
+                    )
+                    cache.set(key, jtis, timeout=REVOKED_CACHE_TIMEOUT)
+                self._revoked = frozenset(jtis)
+                self._version = version
+            self._next_sync = time.monotonic() + self.sync_interval
+
+
+revoked_tokens = RevocationStore()
@@ -1,6 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 from .models import User
+from .revocation import revoked_tokens
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -33,4 +38,20 @@ class RegisterSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop('password2')
         user = User.objects.create_user(**validated_data)
-        return user 
\ No newline at end of file
+        return user 
+
+def _check_not_revoked(token):
+    if revoked_tokens.is_revoked(token.get(api_settings.JTI_CLAIM)):
+        raise TokenError("Token has been revoked")
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    def validate(self, attrs):
+        _check_not_revoked(self.token_class(attrs['refresh']))
+        return super().validate(attrs)
+
+
+class TokenVerifySerializer(jwt_serializers.TokenVerifySerializer):
+    def validate(self, attrs):
+        _check_not_revoked(UntypedToken(attrs['token']))
+        return super().validate(attrs)
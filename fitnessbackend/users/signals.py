@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from config.authentication import user_cache
+from goals.models import Goal
+from nutrition.models import Meal
+from progress.models import ProgressEntry
+from workouts.models import WeightEntry, Workout
+from .dashboard import invalidate_dashboard
+from .models import User
+from .snapshots import schedule_refresh
+
+
+def activity_changed(sender, instance, **kwargs):
+    invalidate_dashboard(instance.user_id)
+
+
+for model in (Workout, Meal):
+    post_save.connect(activity_changed, sender=model, dispatch_uid=f'dashboard-{model.__name__}-saved')
+    post_delete.connect(activity_changed, sender=model, dispatch_uid=f'dashboard-{model.__name__}-deleted')
+
+
+def summary_source_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_refresh(instance.user_id)
+
+
+# Workouts and meals reach the snapshot through the daily rollups, so they
+# are refreshed from progress.signals once the rollup has been updated
+for model in (WeightEntry, ProgressEntry, Goal):
+    post_save.connect(summary_source_changed, sender=model, dispatch_uid=f'summary-{model.__name__}-saved')
+    post_delete.connect(summary_source_changed, sender=model, dispatch_uid=f'summary-{model.__name__}-deleted')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Again after commit, so a concurrent request cannot cache the old row
+    # under the new version
+    user_cache.invalidate(instance.pk)
+    transaction.on_commit(lambda: user_cache.invalidate(instance.pk))
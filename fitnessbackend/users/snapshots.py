@@ -0,0 +1,152 @@
+"""
+Per-user progress summary snapshots.
+
+A snapshot holds week-over-week and month-over-month changes in weight,
+calories, workouts and goal completion. It is recomputed for one user
+after a commit that touches their workouts, meals, weight, progress
+entries or goals, and for everyone by the rebuild_progress_summaries
+command; reading it is a single primary-key lookup.
+
+Calories and workouts come from the daily ProgressEntry rollups, so a
+refresh is three small queries: sixty days of rollups, ninety days of
+weight readings and one conditional aggregate over goals.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from goals.models import Goal
+from progress.models import ProgressEntry
+from workouts.models import WeightEntry
+from .models import ProgressSummary, User
+
+PERIODS = {'week': 7, 'month': 30}
+WEIGHT_LOOKBACK_DAYS = 90
+
+
+def _change(current, previous):
+    if current is None or previous is None:
+        return None
+    return round(current - previous, 2)
+
+
+def _weight_on(readings, day):
+    """Latest reading on or before day; readings are sorted newest first"""
+    for reading_day, weight in readings:
+        if reading_day <= day:
+            return weight
+    return None
+
+
+def _window(rows, start, end, column):
+    return [row[column] for row in rows if start <= row[0] <= end and row[column]]
+
+
+def compute_summary(user_id, today):
+    longest = max(PERIODS.values())
+    rollups = list(
+        ProgressEntry.objects.filter(user_id=user_id, date__gt=today - timedelta(days=2 * longest), date__lte=today)
+        .values_list('date', 'calories_consumed', 'workouts_completed')
+    )
+    since = today - timedelta(days=WEIGHT_LOOKBACK_DAYS)
+    readings = sorted(
+        WeightEntry.objects.filter(user_id=user_id, date__gt=since, date__lte=today)
+        .order_by().values_list('date', 'weight')
+        .union(
+            ProgressEntry.objects.filter(user_id=user_id, date__gt=since, date__lte=today, weight__isnull=False)
+            .order_by().values_list('date', 'weight'),
+            all=True,
+        ),
+        reverse=True,
+    )
+
+    now = timezone.now()
+    completed = Q(status='completed')
+    goal_counts = {
+        'total': Count('id'),
+        'active': Count('id', filter=Q(status__in=('not_started', 'in_progress'))),
+        'completed': Count('id', filter=completed),
+    }
+    for name, days in PERIODS.items():
+        goal_counts[f'completed_{name}'] = Count('id', filter=completed & Q(
+            updated_at__gt=now - timedelta(days=days)
+        ))
+        goal_counts[f'completed_previous_{name}'] = Count('id', filter=completed & Q(
+            updated_at__gt=now - timedelta(days=2 * days), updated_at__lte=now - timedelta(days=days)
+        ))
+    goal_totals = Goal.objects.filter(user_id=user_id).aggregate(**goal_counts)
+
+    current_weight = _weight_on(readings, today)
+    data = {
+        'as_of': today.isoformat(),
+        'weight': {'current': current_weight},
+        'calories': {},
+        'workouts': {},
+        'goals': {
+            'total': goal_totals['total'],
+            'active': goal_totals['active'],
+            'completed': goal_totals['completed'],
+            'completion_rate': (
+                round(goal_totals['completed'] / goal_totals['total'], 3) if goal_totals['total'] else None
+            ),
+        },
+    }
+    for name, days in PERIODS.items():
+        start = today - timedelta(days=days - 1)
+        previous_start = start - timedelta(days=days)
+        previous_end = start - timedelta(days=1)
+
+        data['weight'][f'{name}_change'] = _change(current_weight, _weight_on(readings, previous_end))
+
+        calories = _window(rollups, start, today, 1)
+        previous_calories = _window(rollups, previous_start, previous_end, 1)
+        average = round(sum(calories) / len(calories)) if calories else None
+        previous_average = round(sum(previous_calories) / len(previous_calories)) if previous_calories else None
+        data['calories'][f'{name}_average'] = average
+        data['calories'][f'{name}_change'] = _change(average, previous_average)
+
+        workouts = sum(_window(rollups, start, today, 2))
+        previous_workouts = sum(_window(rollups, previous_start, previous_end, 2))
+        data['workouts'][name] = workouts
+        data['workouts'][f'{name}_change'] = workouts - previous_workouts
+
+        data['goals'][f'completed_{name}'] = goal_totals[f'completed_{name}']
+        data['goals'][f'{name}_change'] = (
+            goal_totals[f'completed_{name}'] - goal_totals[f'completed_previous_{name}']
+        )
+    return data
+
+
+def refresh_summaries(user_ids, today=None):
+    """Recompute and upsert snapshots for the given users; return the snapshots written"""
+    today = today or timezone.now().date()
+    now = timezone.now()
+    # Skip users deleted since the refresh was scheduled
+    existing = User.objects.filter(pk__in=user_ids).values_list('pk', flat=True)
+    snapshots = [
+        ProgressSummary(user_id=user_id, as_of=today, data=compute_summary(user_id, today), updated_at=now)
+        for user_id in existing
+    ]
+    ProgressSummary.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['as_of', 'data', 'updated_at'],
+    )
+    return snapshots
+
+
+def schedule_refresh(user_id):
+    """Refresh one user's snapshot once the current transaction commits"""
+    transaction.on_commit(lambda: refresh_summaries([user_id]))
+
+
+def summary_for(user_id):
+    """Snapshot data for a user, computing it if missing or from an earlier day"""
+    today = timezone.now().date()
+    row = ProgressSummary.objects.filter(pk=user_id).values_list('as_of', 'data').first()
+    if row is not None and row[0] == today:
+        return row[1]
+    snapshots = refresh_summaries([user_id], today)
+    return snapshots[0].data if snapshots else None
@@ -1,3 +1,39 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.test import TransactionTestCase
+from nutrition.models import Meal
+from workouts.models import Exercise, Workout
+from .models import ProgressSummary, User
+
+
+class ProgressSummaryRefreshTests(TransactionTestCase):
+    """Writes run in autocommit here, as in a request, so on_commit fires inline"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='runner', password='pass12345')
+        self.exercise = Exercise.objects.create(
+            name='Squat', description='', muscle_group='Legs', equipment='Barbell', instructions=''
+        )
+
+    def summary(self):
+        return ProgressSummary.objects.get(pk=self.user.pk).data
+
+    def log_workout(self):
+        Workout.objects.create(user=self.user, exercise=self.exercise, sets=3, reps=5, date=date.today())
+
+    def test_new_workouts_are_counted(self):
+        self.log_workout()
+        self.assertEqual(self.summary()['workouts']['week'], 1)
+        self.log_workout()
+        self.assertEqual(self.summary()['workouts']['week'], 2)
+
+    def test_deleted_workout_is_removed(self):
+        self.log_workout()
+        Workout.objects.get().delete()
+        self.assertEqual(self.summary()['workouts']['week'], 0)
+
+    def test_new_meal_is_averaged(self):
+        Meal.objects.create(
+            user=self.user, food='Oats', meal_type='Breakfast', calories=450, date=date.today()
+        )
+        self.assertEqual(self.summary()['calories']['week_average'], 450)
@@ -18,7 +18,6 @@ from django.urls import path
 #     path('logout/', LogoutView.as_view(), name='logout'),
 #     path('profile/', UserDetailView.as_view(), name='user-profile'),
 #     path('dashboard/stats/', dashboard_stats, name='dashboard-stats'),
-#     path('dashboard/recent-activity/', recent_activity, name='recent-activity'),
 #     path('dashboard/progress-summary/', progress_summary, name='progress-summary'),
 #     path('user-detail/', UserDetailView.as_view(), name='user-detail'),
 # ]
@@ -27,9 +26,10 @@ from .views import (
     RegisterView,
     UserDetailView,
     LogoutView,
-    # dashboard_stats,
-    # recent_activity,
-    # progress_summary,
+    ExportView,
+    dashboard_stats,
+    recent_activity,
+    progress_summary,
 )
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -52,10 +52,10 @@ urlpatterns = [
     path('logout/', LogoutView.as_view(), name='logout'),
     path('profile/', UserDetailView.as_view(), name='user-profile'),
     path('user-detail/', UserDetailView.as_view(), name='user-detail'),
-]
+    path('export/', ExportView.as_view(), name='export'),
 
-#     # # ✅ Dashboard APIs
-#     # path('dashboard/stats/', dashboard_stats, name='dashboard-stats'),
-#     path('dashboard/recent-activity/', recent_activity, name='recent-activity'),
-#     path('dashboard/progress-summary/', progress_summary, name='progress-summary'),
-# ]
+    # ✅ Dashboard APIs
+    path('dashboard/stats/', dashboard_stats, name='dashboard-stats'),
+    path('dashboard/recent-activity/', recent_activity, name='recent-activity'),
+    path('dashboard/progress-summary/', progress_summary, name='progress-summary'),
+]
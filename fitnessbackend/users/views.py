@@ -3,12 +3,21 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from .serializers import UserSerializer, RegisterSerializer
+from .activity import activity_page, decode_cursor
+from .dashboard import dashboard_stats_for
+from .snapshots import summary_for
+from .revocation import revoked_tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.utils.urls import replace_query_param
+from .export import EXPORTS, stream_csv_zip, stream_ndjson
+from django.http import StreamingHttpResponse
 from .models import User
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.utils import timezone
-from datetime import timedelta
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -28,48 +37,97 @@ class UserDetailView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # request.user comes from the auth cache with most fields deferred
+        # and may lag a recent save in another process
+        return User.objects.get(pk=self.request.user.pk)
 
 class LogoutView(APIView):
     permission_classes = (permissions.IsAuthenticated,)
 
     def post(self, request):
-        try:
-            return Response({"message": "Successfully logged out."}, 
-                          status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({"message": str(e)}, 
-                          status=status.HTTP_400_BAD_REQUEST)
+        """Revoke the access token in use and, if given, the refresh token"""
+        tokens = [request.auth]
+        if request.data.get('refresh'):
+            try:
+                refresh = RefreshToken(request.data['refresh'])
+            except TokenError as e:
+                return Response({"message": str(e)},
+                              status=status.HTTP_400_BAD_REQUEST)
+            if str(refresh.get(jwt_settings.USER_ID_CLAIM)) != str(request.user.pk):
+                return Response({"message": "Refresh token belongs to another user."},
+                              status=status.HTTP_400_BAD_REQUEST)
+            tokens.append(refresh)
+        revoked_tokens.revoke(*tokens)
+        return Response({"message": "Successfully logged out."},
+                      status=status.HTTP_200_OK)
+
+class ExportView(APIView):
+    """
+    GET /api/export/?output=ndjson|csv&include=workouts,meals
+
+    Streams every row the user owns. ndjson (the default) emits one object
+    per line with a "type" field naming its dataset; csv returns a zip with
+    one CSV per dataset. include limits the export to some datasets.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in ('ndjson', 'csv'):
+            return Response({"detail": "output must be ndjson or csv"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        include = request.query_params.get('include')
+        names = [name.strip() for name in include.split(',') if name.strip()] if include else list(EXPORTS)
+        unknown = [name for name in names if name not in EXPORTS]
+        if unknown or not names:
+            return Response({"detail": f"include must be chosen from {', '.join(EXPORTS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        filename = f"fitness-export-{request.user.username}-{timezone.now().date()}"
+        if output == 'csv':
+            response = StreamingHttpResponse(
+                stream_csv_zip(request.user, names), content_type='application/zip'
+            )
+            filename += '.zip'
+        else:
+            response = StreamingHttpResponse(
+                stream_ndjson(request.user, names), content_type='application/x-ndjson'
+            )
+            filename += '.ndjson'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
-    user = request.user
-    today = timezone.now().date()
-    
-    # Calculate dashboard statistics
-    stats = {
-        'todayWorkouts': user.workout_set.filter(date=today).count(),
-        'calories': sum(meal.calories for meal in user.meal_set.filter(date=today)),
-        'weeklyWorkouts': user.workout_set.filter(
-            date__gte=today - timedelta(days=7)
-        ).count(),
-        'activeMinutes': 145  # Example static value - replace with actual calculation
-    }
-    
-    return Response(stats)
+    """Today's workouts and calories, 7-day workouts and active minutes (cached)"""
+    return Response(dashboard_stats_for(request.user.id))
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def recent_activity(request):
-    # Implementation for recent activity
-    return Response([])
+    """Newest-first feed across all of the user's data; follow "next" to load more"""
+    try:
+        limit = min(max(int(request.query_params.get('page_size', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+    cursor = request.query_params.get('cursor')
+    try:
+        cursor = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return Response({"detail": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+    items, next_cursor = activity_page(request.user, cursor, limit)
+    next_url = None
+    if next_cursor:
+        next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+    return Response({'next': next_url, 'results': items})
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def progress_summary(request):
-    # Implementation for progress summary
-    return Response([])
+    """Week-over-week and month-over-month deltas from the user's snapshot"""
+    return Response(summary_for(request.user.id))
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
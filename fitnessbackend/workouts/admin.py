@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Exercise, Workout, WeightEntry
+from .models import Exercise, ExerciseStats, Workout, WeightEntry
 
 @admin.register(Exercise)
 class ExerciseAdmin(admin.ModelAdmin):
@@ -11,10 +11,19 @@ class ExerciseAdmin(admin.ModelAdmin):
 class WorkoutAdmin(admin.ModelAdmin):
     list_display = ('user', 'exercise', 'sets', 'reps', 'date')
     list_filter = ('date', 'user')
-    search_fields = ('exercise', 'user__username')
+    search_fields = ('exercise__name', 'user__username')
+    list_select_related = ('user', 'exercise')
+    autocomplete_fields = ('exercise',)
     date_hierarchy = 'date'
     ordering = ('-date',)  # Remove created_at from ordering
 
+@admin.register(ExerciseStats)
+class ExerciseStatsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'exercise', 'best_weight', 'session_count', 'last_performed')
+    search_fields = ('exercise__name', 'user__username')
+    list_select_related = ('user', 'exercise')
+    readonly_fields = ('updated_at',)
+
 @admin.register(WeightEntry)
 class WeightEntryAdmin(admin.ModelAdmin):
     list_display = ('user', 'date', 'weight')
@@ -0,0 +1,90 @@
+import threading
+from .models import Exercise, normalize_exercise_name
+
+
+class ExerciseRegistry:
+    """
+    Process-local interning table between exercise names and catalog ids.
+
+    The catalog is loaded once on first use; after that, resolving a name
+    typed by a client is a dict lookup on its normalized form. Names that
+    are not in the catalog yet are added to it, so every workout ends up
+    pointing at a single Exercise row per spelling variant.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = None
+        self._entries = {}
+
+    def _ensure_loaded(self):
+        if self._ids is None:
+            with self._lock:
+                if self._ids is None:
+                    ids = {}
+                    entries = {}
+                    rows = Exercise.objects.order_by('id').values_list('id', 'name', 'normalized_name')
+                    for exercise_id, name, normalized in rows.iterator():
+                        ids.setdefault(normalized, exercise_id)
+                        entries[exercise_id] = (name, normalized)
+                    self._entries = entries
+                    self._ids = ids
+        return self._ids
+
+    def resolve(self, name):
+        """Return the catalog id for a name, creating the exercise if needed"""
+        key = normalize_exercise_name(name)
+        exercise_id = self._ensure_loaded().get(key)
+        if exercise_id is not None:
+            return exercise_id
+
+        exercise = Exercise.objects.filter(normalized_name=key).order_by('id').first()
+        if exercise is None:
+            exercise = Exercise.objects.create(
+                name=' '.join(name.split()),
+                description='',
+                muscle_group='',
+                equipment='',
+                instructions='',
+            )
+        self.add(exercise)
+        return exercise.id
+
+    def name_for(self, exercise_id):
+        self._ensure_loaded()
+        entry = self._entries.get(exercise_id)
+        if entry is None:
+            exercise = Exercise.objects.filter(pk=exercise_id).first()
+            if exercise is None:
+                return None
+            self.add(exercise)
+            return exercise.name
+        return entry[0]
+
+    def add(self, exercise):
+        """Record a created or renamed exercise"""
+        if self._ids is None:
+            return
+        with self._lock:
+            self._forget(exercise.id)
+            self._ids.setdefault(exercise.normalized_name, exercise.id)
+            self._entries[exercise.id] = (exercise.name, exercise.normalized_name)
+
+    def discard(self, exercise_id):
+        if self._ids is None:
+            return
+        with self._lock:
+            self._forget(exercise_id)
+
+    def clear(self):
+        with self._lock:
+            self._ids = None
+            self._entries = {}
+
+    def _forget(self, exercise_id):
+        entry = self._entries.pop(exercise_id, None)
+        if entry is not None and self._ids.get(entry[1]) == exercise_id:
+            del self._ids[entry[1]]
+
+
+exercise_registry = ExerciseRegistry()
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0002_remove_workout_workouts_wo_user_id_f1c995_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workout',
+            index=models.Index(fields=['user', 'date', 'created_at'], name='workouts_wo_user_id_4e2f96_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Max, Sum
+
+
+def backfill_exercise_stats(apps, schema_editor):
+    Workout = apps.get_model('workouts', 'Workout')
+    ExerciseStats = apps.get_model('workouts', 'ExerciseStats')
+    rows = (
+        Workout.objects.values('user_id', 'exercise')
+        .annotate(
+            best_weight=Max('weight'),
+            best_one_rep_max=Max(ExpressionWrapper(
+                F('weight') * (1 + F('reps') / 30.0), output_field=FloatField()
+            )),
+            total_volume=Sum(ExpressionWrapper(
+                F('sets') * F('reps') * F('weight'), output_field=FloatField()
+            )),
+            session_count=Count('date', distinct=True),
+            last_performed=Max('date'),
+        )
+        .order_by()
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        row['total_volume'] = row['total_volume'] or 0.0
+        batch.append(ExerciseStats(**row))
+        if len(batch) >= 2000:
+            ExerciseStats.objects.bulk_create(batch)
+            batch = []
+    ExerciseStats.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0003_workout_user_date_created_at_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exercise', models.CharField(max_length=200)),
+                ('best_weight', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('best_one_rep_max', models.FloatField(blank=True, null=True)),
+                ('total_volume', models.FloatField(default=0)),
+                ('session_count', models.PositiveIntegerField(default=0)),
+                ('last_performed', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Exercise stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='workout',
+            index=models.Index(fields=['user', 'exercise', 'date'], name='workouts_wo_user_id_ef1042_idx'),
+        ),
+        migrations.AddField(
+            model_name='exercisestats',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exercise_stats', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='exercisestats',
+            constraint=models.UniqueConstraint(fields=('user', 'exercise'), name='unique_user_exercise_stats'),
+        ),
+        migrations.RunPython(backfill_exercise_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,142 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Max, Sum
+
+
+def normalize(name):
+    return ' '.join(name.split()).casefold()
+
+
+def rebuild_exercise_stats(Workout, ExerciseStats):
+    rows = (
+        Workout.objects.values('user_id', 'exercise_id')
+        .annotate(
+            best_weight=Max('weight'),
+            best_one_rep_max=Max(ExpressionWrapper(
+                F('weight') * (1 + F('reps') / 30.0), output_field=FloatField()
+            )),
+            total_volume=Sum(ExpressionWrapper(
+                F('sets') * F('reps') * F('weight'), output_field=FloatField()
+            )),
+            session_count=Count('date', distinct=True),
+            last_performed=Max('date'),
+        )
+        .order_by()
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        row['total_volume'] = row['total_volume'] or 0.0
+        batch.append(ExerciseStats(**row))
+        if len(batch) >= 2000:
+            ExerciseStats.objects.bulk_create(batch)
+            batch = []
+    ExerciseStats.objects.bulk_create(batch)
+
+
+def intern_exercise_names(apps, schema_editor):
+    """
+    Point every workout and rollup at a catalog Exercise.
+
+    Names are interned through a dict keyed on their normalized form, so
+    "Bench Press", "bench  press" and " BENCH PRESS" share one row and the
+    catalog is only queried once up front.
+    """
+    Exercise = apps.get_model('workouts', 'Exercise')
+    Workout = apps.get_model('workouts', 'Workout')
+    ExerciseStats = apps.get_model('workouts', 'ExerciseStats')
+
+    interned = {}
+    for exercise in Exercise.objects.order_by('id').iterator():
+        exercise.normalized_name = normalize(exercise.name)
+        exercise.save(update_fields=['normalized_name'])
+        interned.setdefault(exercise.normalized_name, exercise.id)
+
+    def resolve(name):
+        key = normalize(name)
+        if key not in interned:
+            interned[key] = Exercise.objects.create(
+                name=' '.join(name.split()),
+                normalized_name=key,
+                description='',
+                muscle_group='',
+                equipment='',
+                instructions='',
+            ).id
+        return interned[key]
+
+    names = Workout.objects.values_list('exercise_name', flat=True).distinct().order_by()
+    for name in list(names):
+        Workout.objects.filter(exercise_name=name).update(exercise_id=resolve(name))
+
+    # Spelling variants used to have separate rollups; merge them by
+    # rebuilding from the now-normalized workouts.
+    ExerciseStats.objects.all().delete()
+    rebuild_exercise_stats(Workout, ExerciseStats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0004_exercisestats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='normalized_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=200),
+            preserve_default=False,
+        ),
+        migrations.RemoveIndex(
+            model_name='workout',
+            name='workouts_wo_user_id_ef1042_idx',
+        ),
+        migrations.RemoveConstraint(
+            model_name='exercisestats',
+            name='unique_user_exercise_stats',
+        ),
+        migrations.RemoveField(
+            model_name='exercisestats',
+            name='exercise',
+        ),
+        migrations.RenameField(
+            model_name='workout',
+            old_name='exercise',
+            new_name='exercise_name',
+        ),
+        migrations.AddField(
+            model_name='workout',
+            name='exercise',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='workouts', to='workouts.exercise'),
+        ),
+        migrations.AddField(
+            model_name='exercisestats',
+            name='exercise',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='workouts.exercise'),
+        ),
+        migrations.RunPython(intern_exercise_names, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='workout',
+            name='exercise_name',
+        ),
+        migrations.AlterField(
+            model_name='workout',
+            name='exercise',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='workouts', to='workouts.exercise'),
+        ),
+        migrations.AlterField(
+            model_name='exercisestats',
+            name='exercise',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='workouts.exercise'),
+        ),
+        migrations.AddIndex(
+            model_name='workout',
+            index=models.Index(fields=['user', 'exercise', 'date'], name='workouts_wo_user_id_50ec81_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='exercisestats',
+            constraint=models.UniqueConstraint(fields=('user', 'exercise'), name='unique_user_exercise_stats'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0005_workout_exercise_fk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workout',
+            name='duration',
+            field=models.PositiveIntegerField(blank=True, help_text='Minutes spent on this exercise, if recorded', null=True),
+        ),
+    ]
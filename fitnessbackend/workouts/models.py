@@ -1,13 +1,22 @@
 from django.db import models
 from django.conf import settings
 
+def normalize_exercise_name(name):
+    """Case- and whitespace-insensitive key used to intern exercise names"""
+    return ' '.join(name.split()).casefold()
+
 class Exercise(models.Model):
     name = models.CharField(max_length=200)
+    normalized_name = models.CharField(max_length=200, db_index=True, editable=False)
     description = models.TextField()
     muscle_group = models.CharField(max_length=100)
     equipment = models.CharField(max_length=200)
     instructions = models.TextField()
 
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_exercise_name(self.name)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -17,7 +26,11 @@ class Workout(models.Model):
         on_delete=models.CASCADE,
         related_name='workouts'
     )
-    exercise = models.CharField(max_length=200)
+    exercise = models.ForeignKey(
+        Exercise,
+        on_delete=models.PROTECT,
+        related_name='workouts'
+    )
     sets = models.PositiveIntegerField()
     reps = models.PositiveIntegerField()
     weight = models.DecimalField(
@@ -27,15 +40,57 @@ class Workout(models.Model):
         blank=True
     )
     date = models.DateField()
+    duration = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='Minutes spent on this exercise, if recorded'
+    )
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['user', 'date', 'created_at']),
+            models.Index(fields=['user', 'exercise', 'date']),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.exercise} ({self.date})"
 
+class ExerciseStats(models.Model):
+    """Per-user, per-exercise rollup kept in step with Workout writes"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='exercise_stats'
+    )
+    exercise = models.ForeignKey(
+        Exercise,
+        on_delete=models.CASCADE,
+        related_name='stats'
+    )
+    best_weight = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        null=True,
+        blank=True
+    )
+    best_one_rep_max = models.FloatField(null=True, blank=True)
+    total_volume = models.FloatField(default=0)
+    session_count = models.PositiveIntegerField(default=0)
+    last_performed = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'exercise'], name='unique_user_exercise_stats'),
+        ]
+        verbose_name_plural = 'Exercise stats'
+
+    def __str__(self):
+        return f"{self.user.username} - {self.exercise} stats"
+
 class WeightEntry(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     date = models.DateField()
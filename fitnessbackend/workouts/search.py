@@ -0,0 +1,145 @@
+"""
+Full-text search over the Exercise catalog.
+
+On SQLite the catalog is mirrored into an FTS5 external-content table that
+triggers keep in step with every insert, update and delete on
+workouts_exercise, whichever code path issues them. Matches are ranked with
+bm25 (name weighted above instructions and description) and facet counts
+come from the same MATCH, so cost tracks the number of hits rather than
+the catalog size. Other databases fall back to an unranked icontains scan.
+"""
+import re
+from django.db import connection
+from django.db.models import Count, Q
+from .models import Exercise
+
+FTS_TABLE = 'workouts_exercise_fts'
+FACET_FIELDS = ('muscle_group', 'equipment')
+
+_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON workouts_exercise BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description, instructions)
+            VALUES (new.id, new.name, new.description, new.instructions);
+        END""",
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON workouts_exercise BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, instructions)
+            VALUES ('delete', old.id, old.name, old.description, old.instructions);
+        END""",
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON workouts_exercise BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, instructions)
+            VALUES ('delete', old.id, old.name, old.description, old.instructions);
+            INSERT INTO {FTS_TABLE}(rowid, name, description, instructions)
+            VALUES (new.id, new.name, new.description, new.instructions);
+        END""",
+}
+
+
+def fts_available(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def ensure_search_index(using=connection):
+    """
+    Create the FTS table and sync triggers if they are missing.
+
+    Runs after every migrate: SQLite rebuilds workouts_exercise for most
+    ALTERs, which drops its triggers, so the index is reinstalled and
+    rebuilt whenever that happens.
+    """
+    if not fts_available(using):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            list(_TRIGGERS),
+        )
+        if len(cursor.fetchall()) == len(_TRIGGERS):
+            return
+
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                name, description, instructions,
+                content='workouts_exercise', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )""")
+        for sql in _TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def build_match_query(text):
+    """Quote each token so user input cannot inject FTS5 syntax; all tokens prefix-match"""
+    tokens = re.findall(r'\w+', text)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_exercises(text, filters=None, limit=20):
+    """
+    Return ``(exercises, total, facets)`` for a search string.
+
+    ``filters`` maps facet fields to exact values. Each facet's counts
+    ignore that facet's own filter so clients can show the alternatives.
+    """
+    filters = {field: value for field, value in (filters or {}).items() if value}
+    match = build_match_query(text)
+    if not match:
+        return [], 0, {field: {} for field in FACET_FIELDS}
+
+    if not fts_available():
+        return _search_fallback(text, filters, limit)
+
+    base_sql = (
+        f"FROM {FTS_TABLE} JOIN workouts_exercise e ON e.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s"
+    )
+
+    def where(exclude=None):
+        sql = base_sql
+        params = [match]
+        for field, value in filters.items():
+            if field != exclude:
+                sql += f' AND e.{field} = %s'
+                params.append(value)
+        return sql, params
+
+    with connection.cursor() as cursor:
+        sql, params = where()
+        cursor.execute(f'SELECT COUNT(*) {sql}', params)
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f'SELECT e.id {sql} ORDER BY bm25({FTS_TABLE}, 10.0, 1.0, 2.0) LIMIT %s',
+            params + [limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+        facets = {}
+        for field in FACET_FIELDS:
+            sql, params = where(exclude=field)
+            cursor.execute(f'SELECT e.{field}, COUNT(*) {sql} GROUP BY e.{field}', params)
+            facets[field] = {value: count for value, count in cursor.fetchall() if value}
+
+    by_id = Exercise.objects.in_bulk(ids)
+    return [by_id[pk] for pk in ids if pk in by_id], total, facets
+
+
+def _search_fallback(text, filters, limit):
+    condition = Q()
+    for token in re.findall(r'\w+', text):
+        condition &= (
+            Q(name__icontains=token)
+            | Q(description__icontains=token)
+            | Q(instructions__icontains=token)
+        )
+    matches = Exercise.objects.filter(condition)
+
+    facets = {}
+    for field in FACET_FIELDS:
+        others = {key: value for key, value in filters.items() if key != field}
+        rows = matches.filter(**others).values(field).annotate(count=Count('id')).order_by()
+        facets[field] = {row[field]: row['count'] for row in rows if row[field]}
+
+    matches = matches.filter(**filters)
+    return list(matches.order_by('name')[:limit]), matches.count(), facets
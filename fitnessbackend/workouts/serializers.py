@@ -1,24 +1,70 @@
 from rest_framework import serializers
-from .models import Exercise, Workout, WeightEntry
+from .exercises import exercise_registry
+from .models import Exercise, ExerciseStats, Workout, WeightEntry
 
 class ExerciseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Exercise
-        fields = '__all__'
+        exclude = ['normalized_name']
+
+class ExerciseNameField(serializers.Field):
+    """
+    Reads an exercise foreign key as the exercise name.
+
+    Writes validate to the cleaned name, not an id; serializers using the
+    field resolve it with ``with_exercise_id`` when saving, so a name is
+    only added to the catalog once the whole item is valid.
+    """
+    default_error_messages = {
+        'invalid': 'Enter an exercise name.',
+        'max_length': 'Ensure this field has no more than 200 characters.',
+    }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str) or not data.strip():
+            self.fail('invalid')
+        if len(data) > 200:
+            self.fail('max_length')
+        return ' '.join(data.split())
+
+    def to_representation(self, value):
+        return exercise_registry.name_for(value)
+
+def with_exercise_id(validated_data):
+    """Replace a validated exercise name with its catalog id, adding it if new"""
+    if 'exercise_id' in validated_data:
+        validated_data['exercise_id'] = exercise_registry.resolve(validated_data['exercise_id'])
+    return validated_data
 
 class WorkoutSerializer(serializers.ModelSerializer):
+    exercise = ExerciseNameField(source='exercise_id')
+
     class Meta:
         model = Workout
-        fields = ['id', 'exercise', 'sets', 'reps', 'weight', 'date', 'notes']
+        fields = ['id', 'exercise', 'sets', 'reps', 'weight', 'date', 'duration', 'notes']
         read_only_fields = ['id']
 
     def validate(self, data):
-        if not data.get('exercise'):
+        if not data.get('exercise_id'):
             raise serializers.ValidationError({"exercise": "This field is required"})
         if not data.get('date'):
             raise serializers.ValidationError({"date": "This field is required"})
         return data
 
+    def create(self, validated_data):
+        return super().create(with_exercise_id(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, with_exercise_id(validated_data))
+
+class ExerciseStatsSerializer(serializers.ModelSerializer):
+    exercise = ExerciseNameField(source='exercise_id', read_only=True)
+
+    class Meta:
+        model = ExerciseStats
+        fields = ['exercise', 'best_weight', 'best_one_rep_max', 'total_volume',
+                  'session_count', 'last_performed']
+
 class WeightEntrySerializer(serializers.ModelSerializer):
     class Meta:
         model = WeightEntry
@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from config.catalog import bump_catalog_version
+from .exercises import exercise_registry
+from .models import Exercise, Workout
+from .stats import apply_workout, refresh_exercise_stats
+
+
+@receiver(pre_save, sender=Workout)
+def remember_previous_exercise(sender, instance, **kwargs):
+    """Keep the stored exercise and date so a change can refresh both rollups"""
+    instance._previous_exercise = instance._previous_date = None
+    if instance.pk:
+        previous = (
+            Workout.objects.filter(pk=instance.pk)
+            .values_list('exercise_id', 'date')
+            .first()
+        )
+        if previous:
+            instance._previous_exercise, instance._previous_date = previous
+
+
+@receiver(post_save, sender=Workout)
+def update_exercise_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_workout(instance)
+        return
+
+    refresh_exercise_stats(instance.user_id, instance.exercise_id)
+    previous = getattr(instance, '_previous_exercise', None)
+    if previous and previous != instance.exercise_id:
+        refresh_exercise_stats(instance.user_id, previous)
+
+
+@receiver(post_delete, sender=Workout)
+def remove_exercise_stats(sender, instance, **kwargs):
+    refresh_exercise_stats(instance.user_id, instance.exercise_id)
+
+
+@receiver(post_save, sender=Exercise)
+def register_exercise(sender, instance, raw=False, **kwargs):
+    if not raw:
+        exercise_registry.add(instance)
+    bump_catalog_version('exercises')
+
+
+@receiver(post_delete, sender=Exercise)
+def unregister_exercise(sender, instance, **kwargs):
+    exercise_registry.discard(instance.id)
+    bump_catalog_version('exercises')
@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Max, Sum
+from .models import ExerciseStats, Workout
+
+
+def estimate_one_rep_max(weight, reps):
+    """Epley estimate of the one-rep max for a set"""
+    if weight is None:
+        return None
+    return float(weight) * (1 + reps / 30.0)
+
+
+def workout_volume(workout):
+    if workout.weight is None:
+        return 0.0
+    return float(workout.weight) * workout.sets * workout.reps
+
+
+def apply_workout(workout):
+    """Fold a newly created workout into its exercise rollup"""
+    with transaction.atomic():
+        stats, _ = ExerciseStats.objects.select_for_update().get_or_create(
+            user_id=workout.user_id, exercise_id=workout.exercise_id
+        )
+        same_day = Workout.objects.filter(
+            user_id=workout.user_id, exercise_id=workout.exercise_id, date=workout.date
+        ).exclude(pk=workout.pk)
+        if not same_day.exists():
+            stats.session_count += 1
+
+        stats.total_volume += workout_volume(workout)
+        if workout.weight is not None:
+            if stats.best_weight is None or workout.weight > stats.best_weight:
+                stats.best_weight = workout.weight
+            one_rep_max = estimate_one_rep_max(workout.weight, workout.reps)
+            if stats.best_one_rep_max is None or one_rep_max > stats.best_one_rep_max:
+                stats.best_one_rep_max = one_rep_max
+        if stats.last_performed is None or workout.date > stats.last_performed:
+            stats.last_performed = workout.date
+        stats.save()
+    return stats
+
+
+def refresh_exercise_stats(user_id, exercise_id):
+    """
+    Rebuild one rollup from that user's rows for the exercise.
+
+    Used after updates and deletes, where a maximum cannot be decremented
+    in place. The (user, exercise, date) index keeps this to a single range
+    scan over one exercise rather than the user's whole history.
+    """
+    totals = Workout.objects.filter(user_id=user_id, exercise_id=exercise_id).aggregate(
+        best_weight=Max('weight'),
+        best_one_rep_max=Max(ExpressionWrapper(
+            F('weight') * (1 + F('reps') / 30.0), output_field=FloatField()
+        )),
+        total_volume=Sum(ExpressionWrapper(
+            F('sets') * F('reps') * F('weight'), output_field=FloatField()
+        )),
+        session_count=Count('date', distinct=True),
+        last_performed=Max('date'),
+    )
+    if not totals['session_count']:
+        ExerciseStats.objects.filter(user_id=user_id, exercise_id=exercise_id).delete()
+        return None
+
+    totals['total_volume'] = totals['total_volume'] or 0.0
+    stats, _ = ExerciseStats.objects.update_or_create(
+        user_id=user_id, exercise_id=exercise_id, defaults=totals
+    )
+    return stats
@@ -1,3 +1,99 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from users.models import User
+from .exercises import exercise_registry
+from .models import Exercise, Workout
+
+
+class WorkoutApiTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='rower', password='pass12345')
+        self.exercise = Exercise.objects.create(
+            name='Bench Press', description='', muscle_group='Chest', equipment='Barbell', instructions=''
+        )
+        exercise_registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class WorkoutPaginationTests(WorkoutApiTestCase):
+    def setUp(self):
+        super().setUp()
+        today = date.today()
+        # Three days of seven workouts each, all sharing one created_at,
+        # so only the id tells rows on the same day apart.
+        Workout.objects.bulk_create([
+            Workout(user=self.user, exercise=self.exercise, sets=3, reps=i, date=today - timedelta(days=day))
+            for day in range(3) for i in range(7)
+        ])
+        Workout.objects.update(created_at=timezone.now())
+        self.expected = list(
+            Workout.objects.order_by('-date', '-created_at', '-id').values_list('id', flat=True)
+        )
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_pages_cover_every_row_once(self):
+        seen = []
+        url = '/api/workouts/workouts/?page_size=5'
+        while url:
+            page = self.get(url)
+            self.assertLessEqual(len(page['results']), 5)
+            seen.extend(row['id'] for row in page['results'])
+            url = page['next']
+        self.assertEqual(seen, self.expected)
+
+    def test_page_size_alone_returns_first_page(self):
+        page = self.get('/api/workouts/workouts/?page_size=4')
+        self.assertEqual([row['id'] for row in page['results']], self.expected[:4])
+        self.assertIsNotNone(page['next'])
+
+    def test_without_cursor_or_page_size_returns_plain_list(self):
+        rows = self.get('/api/workouts/workouts/')
+        self.assertIsInstance(rows, list)
+        self.assertEqual(sorted(row['id'] for row in rows), sorted(self.expected))
+
+    def test_malformed_cursor_is_not_found(self):
+        for cursor in ('not-base64!', 'WyJ4IiwieSIsInoiXQ==', 'WzFd', 'eyJhIjoxfQ=='):
+            response = self.client.get('/api/workouts/workouts/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class WorkoutBulkTests(WorkoutApiTestCase):
+    def item(self, **fields):
+        return {'exercise': 'Bench Press', 'sets': 3, 'reps': 8, 'date': '2024-01-01', **fields}
+
+    def bulk(self, payload):
+        return self.client.post('/api/workouts/workouts/bulk/', payload, format='json')
+
+    def test_invalid_items_are_reported_by_index(self):
+        response = self.bulk([
+            self.item(),
+            self.item(sets=-1),
+            self.item(exercise='Deadlift'),
+            self.item(date=None),
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['created']), 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 3])
+        self.assertIn('sets', response.data['errors'][0]['errors'])
+        self.assertIn('date', response.data['errors'][1]['errors'])
+        self.assertEqual(Workout.objects.filter(user=self.user).count(), 2)
+
+    def test_invalid_item_adds_no_exercise(self):
+        response = self.bulk({'workouts': [self.item(exercise='Hip Thrust', reps='many')]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['created'], [])
+        self.assertEqual(response.data['errors'][0]['index'], 0)
+        self.assertFalse(Exercise.objects.filter(name='Hip Thrust').exists())
 
-# Create your tests here.
+    def test_payload_must_be_a_list(self):
+        response = self.bulk({'workout': self.item()})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'detail': 'Expected a list of workouts'})
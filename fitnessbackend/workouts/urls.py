@@ -1,8 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import WorkoutViewSet
+from .views import ExerciseViewSet, WorkoutViewSet
 
 router = DefaultRouter()
+router.register(r'exercises', ExerciseViewSet)
 router.register(r'workouts', WorkoutViewSet, basename='workout')
 
 urlpatterns = [
@@ -2,20 +2,79 @@ from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from django.core.exceptions import ValidationError
-from .models import Exercise, Workout, WeightEntry
-from .serializers import ExerciseSerializer, WorkoutSerializer, WeightEntrySerializer
-from django.db.models import Q, Max, Avg, Count
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from .models import Exercise, ExerciseStats, Workout, WeightEntry
+from .serializers import (
+    ExerciseSerializer, ExerciseStatsSerializer, WorkoutSerializer, WeightEntrySerializer,
+    with_exercise_id,
+)
+from .search import FACET_FIELDS, search_exercises
+from .stats import refresh_exercise_stats
+from progress.rollups import refresh_days
+from goals.evaluation import evaluate_goals
+from users.dashboard import invalidate_dashboard
+from users.snapshots import schedule_refresh
+from django.db import transaction
+from django.db.models import ProtectedError
+from django.db.models import Q, Max, Avg, Count, ExpressionWrapper, F, FloatField, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
 from datetime import datetime, timedelta
 from rest_framework.decorators import action
+from config.catalog import CachedCatalogMixin
+from config.compact import CompactResponseMixin
+from config.pagination import KeysetPagination
 
-class ExerciseViewSet(viewsets.ModelViewSet):
+class WorkoutPagination(KeysetPagination):
+    ordering = ('-date', '-created_at', '-id')
+
+HISTORY_BUCKETS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+class ExerciseViewSet(CachedCatalogMixin, viewsets.ModelViewSet):
     queryset = Exercise.objects.all()
     serializer_class = ExerciseSerializer
     permission_classes = [permissions.IsAuthenticated]
+    catalog_name = 'exercises'
+    search_max_results = 100
+
+    def destroy(self, request, *args, **kwargs):
+        try:
+            return super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            return Response(
+                {"detail": "This exercise is used by logged workouts and cannot be deleted"},
+                status=status.HTTP_409_CONFLICT
+            )
 
-class WorkoutViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Ranked full-text search with muscle group and equipment facet counts"""
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 20
+        limit = max(1, min(limit, self.search_max_results))
+
+        filters = {field: request.query_params.get(field) for field in FACET_FIELDS}
+        exercises, total, facets = search_exercises(
+            request.query_params.get('q', ''), filters, limit
+        )
+        serializer = self.get_serializer(exercises, many=True)
+        return Response({
+            'count': total,
+            'results': serializer.data,
+            'facets': facets,
+        })
+
+class WorkoutViewSet(CompactResponseMixin, viewsets.ModelViewSet):
     serializer_class = WorkoutSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = WorkoutPagination
+    bulk_max_items = 1000
 
     def get_queryset(self):
         """Return workouts for the current user"""
@@ -49,6 +108,50 @@ class WorkoutViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create many workouts in one transaction, reporting invalid items by index"""
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get('workouts')
+        if not isinstance(items, list):
+            return Response(
+                {"detail": "Expected a list of workouts"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {"detail": f"At most {self.bulk_max_items} workouts per request"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        valid = []
+        errors = []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        # Only items that passed validation may add names to the catalog
+        valid = [Workout(user=request.user, **with_exercise_id(data)) for data in valid]
+        with transaction.atomic():
+            created = Workout.objects.bulk_create(valid)
+            # bulk_create skips post_save, so refresh each touched rollup once
+            for exercise_id in {workout.exercise_id for workout in created}:
+                refresh_exercise_stats(request.user.id, exercise_id)
+            refresh_days(request.user.id, {workout.date for workout in created})
+            evaluate_goals(request.user.id, 'workout')
+        invalidate_dashboard(request.user.id)
+        schedule_refresh(request.user.id)
+
+        serializer = self.get_serializer(created, many=True)
+        return Response(
+            {'created': serializer.data, 'errors': errors},
+            status=status.HTTP_201_CREATED if created or not errors else status.HTTP_400_BAD_REQUEST
+        )
+
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         if instance.user != request.user:
@@ -80,9 +183,58 @@ class WorkoutViewSet(viewsets.ModelViewSet):
         else:  # year
             start_date = today - timedelta(days=365)
             
-        workouts = self.get_queryset().filter(date__gte=start_date)
+        workouts = Workout.objects.filter(user=request.user, date__gte=start_date)
+
+        bucket = request.query_params.get('bucket')
+        if bucket:
+            if bucket not in HISTORY_BUCKETS:
+                return Response(
+                    {"detail": f"bucket must be one of: {', '.join(HISTORY_BUCKETS)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response(self._bucketed_history(workouts, HISTORY_BUCKETS[bucket]))
+
+        page = self.paginate_queryset(workouts)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(workouts, many=True)
-        
+        return Response(serializer.data)
+
+    def _bucketed_history(self, workouts, trunc):
+        """Aggregate workouts per period in the database"""
+        rows = (
+            workouts.annotate(period=trunc('date'))
+            .values('period')
+            .annotate(
+                set_count=Sum('sets'),
+                rep_count=Sum(F('sets') * F('reps')),
+                tonnage=Sum(ExpressionWrapper(
+                    F('sets') * F('reps') * F('weight'), output_field=FloatField()
+                )),
+                exercise_count=Count('exercise', distinct=True),
+            )
+            .order_by('period')
+        )
+        return [
+            {
+                'period': row['period'],
+                'sets': row['set_count'],
+                'reps': row['rep_count'],
+                'tonnage': row['tonnage'] or 0,
+                'exercises': row['exercise_count'],
+            }
+            for row in rows
+        ]
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Get the user's rollup for the exercise with the given id"""
+        if not pk.isdigit():
+            raise Http404
+        stats = get_object_or_404(ExerciseStats, user=request.user, exercise_id=pk)
+        serializer = ExerciseStatsSerializer(stats)
         return Response(serializer.data)
 
 class WeightEntryViewSet(viewsets.ModelViewSet):